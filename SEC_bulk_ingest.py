@@ -0,0 +1,203 @@
+import argparse
+import csv
+import datetime as dt
+import logging
+import zipfile
+import pandas as pd
+from pathlib import Path
+from typing import List, Dict
+
+from settings import LINK
+from arg_parser import get_sec_bulk_parser
+from base_scraper import BaseScraper, RecordBuffer
+from form4_records import Form4RecordMixin, format_title
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SUBMISSION_COLUMNS = ['ACCESSION_NUMBER', 'FILING_DATE', 'DOCUMENT_TYPE', 'ISSUERTRADINGSYMBOL', 'REMARKS']
+OWNER_COLUMNS = ['ACCESSION_NUMBER', 'RPTOWNERNAME', 'RPTOWNER_RELATIONSHIP', 'RPTOWNER_TITLE']
+TRANS_COLUMNS = [
+    'ACCESSION_NUMBER', 'TRANS_DATE', 'TRANS_CODE', 'TRANS_SHARES',
+    'TRANS_PRICEPERSHARE', 'TRANS_ACQUIRED_DISP_CD'
+]
+DATE_FORMAT = '%d-%b-%Y'  # e.g. 02-JAN-2024
+
+
+class SECBulkIngester(Form4RecordMixin, BaseScraper):
+    """Ingest SEC quarterly insider transaction data sets (Form 3/4/5 ZIP archives of TSV files)
+
+    Shares transaction parsing and combining with the SEC scraper, so rows match scraped
+    Form 4 filings. The data sets only carry the filing date, so 'Filing Date' has no time
+    part and rows don't match scraped ones on the trade key. In merge mode filings already
+    stored are therefore skipped by accession number instead.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.comb_adj_dates = not args.d
+        self.archives = self._find_archives([Path(p) for p in args.archives])
+        self.tickers = {t.strip().upper() for t in args.tickers} if args.tickers else set()
+        self.stored_accessions = set()
+
+        # Initialize BaseScraper
+        output_path = Path(args.s) if args.s else LINK
+        save_mode = 'merge'
+        if args.rewrite:
+            save_mode = 'rewrite'
+        elif args.append:
+            save_mode = 'append'
+        super().__init__(output_path, save_mode)
+
+    @staticmethod
+    def _find_archives(paths: List[Path]) -> List[Path]:
+        """Expand directories to the ZIP archives they contain"""
+        archives = []
+        for path in paths:
+            if path.is_dir():
+                archives += sorted(path.glob('*.zip'))
+            elif path.exists():
+                archives.append(path)
+            else:
+                raise FileNotFoundError(f"Archive not found: {path}")
+        return archives
+
+    def close_session(self):
+        """No network session to close"""
+
+    @staticmethod
+    def _read_table(archive: zipfile.ZipFile, name: str, columns: List[str]) -> pd.DataFrame:
+        """Stream one TSV table out of the archive"""
+        members = [m for m in archive.namelist() if Path(m).name.upper() == name]
+        if not members:
+            raise ValueError(f"{name} not found in {archive.filename}")
+
+        with archive.open(members[0]) as f:
+            return pd.read_csv(
+                f, sep='\t', usecols=columns, dtype=str, keep_default_na=False,
+                quoting=csv.QUOTE_NONE, encoding='utf-8', encoding_errors='replace'
+            )
+
+    @staticmethod
+    def _owner_title(owner: Dict, remarks: str) -> str:
+        """Extract and format insider title from reporting owner fields"""
+        relationship = {part.strip() for part in owner['RPTOWNER_RELATIONSHIP'].split(',')}
+        # The data sets leave a missing title empty
+        return format_title(
+            'Officer' in relationship, owner['RPTOWNER_TITLE'] or None, remarks,
+            'Director' in relationship, 'TenPercentOwner' in relationship
+        )
+
+    @staticmethod
+    def _raw_transaction(row: Dict) -> Dict:
+        """Map data set transaction row to the raw fields of a parsed Form 4 transaction"""
+        try:
+            date = dt.datetime.strptime(row['TRANS_DATE'], DATE_FORMAT).date().isoformat()
+        except ValueError:
+            date = None
+
+        return {
+            'date': date,
+            'code': row['TRANS_CODE'] or None,
+            'shares': row['TRANS_SHARES'] or None,
+            'price': row['TRANS_PRICEPERSHARE'] or None,
+            'acquired_disposed': row['TRANS_ACQUIRED_DISP_CD'] or None,
+        }
+
+    def _ingest_archive(self, path: Path, records: RecordBuffer):
+        """Convert Form 4 transactions of one quarterly archive to output rows"""
+        logger.info(f"Ingesting {path}")
+
+        with zipfile.ZipFile(path) as archive:
+            submissions = self._read_table(archive, 'SUBMISSION.TSV', SUBMISSION_COLUMNS)
+            submissions = submissions[submissions['DOCUMENT_TYPE'] == '4']
+            symbols = submissions['ISSUERTRADINGSYMBOL'].str.strip().str.upper()  # Some filers use lower case
+            submissions = submissions.assign(ISSUERTRADINGSYMBOL=symbols)
+            if self.tickers:
+                submissions = submissions[submissions['ISSUERTRADINGSYMBOL'].isin(self.tickers)]
+            if self.stored_accessions:
+                submissions = submissions[~submissions['ACCESSION_NUMBER'].isin(self.stored_accessions)]
+            accessions = set(submissions['ACCESSION_NUMBER'])
+
+            # First reporting owner of each filing, as in the scraped documents
+            owners = self._read_table(archive, 'REPORTINGOWNER.TSV', OWNER_COLUMNS)
+            owners = owners[owners['ACCESSION_NUMBER'].isin(accessions)].drop_duplicates('ACCESSION_NUMBER')
+
+            # Non-derivative transactions come first, as in the scraped documents
+            derivative_transactions = self._read_table(archive, 'DERIV_TRANS.TSV', TRANS_COLUMNS)
+            transactions = pd.concat([
+                self._read_table(archive, 'NONDERIV_TRANS.TSV', TRANS_COLUMNS), derivative_transactions
+            ], ignore_index=True)
+            transactions = transactions[transactions['ACCESSION_NUMBER'].isin(accessions)]
+
+            # Filings with a derivative table, which may only hold derivative positions
+            holdings = self._read_table(archive, 'DERIV_HOLDING.TSV', ['ACCESSION_NUMBER'])
+            derivative = set(derivative_transactions['ACCESSION_NUMBER']) | set(holdings['ACCESSION_NUMBER'])
+
+        submissions = submissions.set_index('ACCESSION_NUMBER').to_dict('index')
+        owners = owners.set_index('ACCESSION_NUMBER').to_dict('index')
+
+        parsed = []
+        for accession_number, group in transactions.groupby('ACCESSION_NUMBER', sort=False):
+            submission = submissions[accession_number]
+            owner = owners.get(accession_number)
+            if owner is None:
+                logger.warning(f"Missing reporting owner in {accession_number}")
+                continue
+
+            try:
+                filing_data = {
+                    'X': 'D' if accession_number in derivative else '',
+                    'Filing Date': dt.datetime.strptime(submission['FILING_DATE'], DATE_FORMAT),
+                    'Ticker': submission['ISSUERTRADINGSYMBOL'],
+                    'Insider Name': self._normalize_name(owner['RPTOWNERNAME']),
+                    'Title': self._owner_title(owner, submission['REMARKS']),
+                    'FC': accession_number
+                }
+            except ValueError as e:
+                logger.warning(f"Invalid filing data in {accession_number}: {str(e)}")
+                continue
+
+            for row in group.to_dict('records'):
+                try:
+                    parsed.append(self._parse_transaction(self._raw_transaction(row), filing_data))
+                except Exception as e:
+                    logger.warning(f"Failed to parse transaction in {accession_number}: {str(e)}")
+
+        # Combine all filings of the archive in one vectorized pass
+        combined = self._combine_transactions_frame(pd.DataFrame(parsed))
+        records.add_frame(combined)
+        logger.info(f"Ingested {len(combined)} records from {path}")
+
+    def scrape(self) -> pd.DataFrame:
+        """Main ingest controller"""
+        if self.save_mode == 'merge':
+            self.stored_accessions = self.load_existing_accessions()
+            logger.info(f"Skipping {len(self.stored_accessions)} stored filings")
+
+        records = RecordBuffer()
+        for path in self.archives:
+            try:
+                self._ingest_archive(path, records)
+            except Exception as e:
+                logger.error(f"Failed to ingest {path}: {str(e)}")
+
+        return self._standardize_types(records.to_frame())
+
+
+def main():
+    parser = get_sec_bulk_parser()
+    args = parser.parse_args()
+
+    try:
+        ingester = SECBulkIngester(args)
+        df = ingester.scrape()
+        ingester.save_results(df)
+        logger.info("Ingest completed successfully")
+    except Exception as e:
+        logger.error(f"Ingest failed: {str(e)}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
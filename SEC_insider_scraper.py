@@ -1,31 +1,66 @@
 import argparse
+import asyncio
+import json
 import time
 import pandas as pd
 import requests
-import datetime as dt
-import re
 import logging
-from bs4 import BeautifulSoup
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from settings import SEC_REQUEST_DELAY, USER_AGENT, LINK
+from settings import (
+    SEC_REQUEST_DELAY, SEC_MAX_RATE, SEC_CONCURRENCY, SEC_CACHE_DIR, SEC_CACHE_MAX_MB,
+    SEC_PARSE_WORKERS, SEC_QUEUE_SIZE, SEC_THROTTLE_COOLDOWN, SEC_THROTTLE_RETRIES,
+    CIK_MAP_PATH, CIK_MAP_TTL_HOURS, USER_AGENT, LINK
+)
 from arg_parser import get_sec_parser
-from base_scraper import BaseScraper, COLUMNS
+from base_scraper import BaseScraper, RecordBuffer, COLUMNS
+from rate_limiter import AdaptiveRateLimiter
+from filing_cache import FilingCache
+from form4_parser import Form4Document
+from form4_records import Form4RecordMixin, format_title
+from cik_resolver import CIKResolver
+from progress_journal import ProgressJournal
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class SECScraper(BaseScraper):
+class SECScraper(Form4RecordMixin, BaseScraper):
     def __init__(self, args: argparse.Namespace):
         self.args = args
 
         # Initialize session
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': USER_AGENT})
-        self.last_request_time = dt.datetime.now()
         self.comb_adj_dates = not args.d
         self.filing_limit = args.l if args.l else -1
+        self.use_async = args.use_async
+        self.max_rate = args.rate or SEC_MAX_RATE
+        self.concurrency = args.concurrency or SEC_CONCURRENCY
+        self.pipeline = args.pipeline
+        self.parse_workers = args.parse_workers or SEC_PARSE_WORKERS
+
+        # Initialize rate limiter without bursts, a full bucket on top of the refill would exceed the SEC limit
+        if self.use_async or self.pipeline:
+            self.limiter = AdaptiveRateLimiter(self.max_rate, cooldown=SEC_THROTTLE_COOLDOWN)
+        else:
+            max_rate = 1 / SEC_REQUEST_DELAY if SEC_REQUEST_DELAY > 0 else self.max_rate
+            self.limiter = AdaptiveRateLimiter(max_rate, cooldown=SEC_THROTTLE_COOLDOWN)
+
+        # Initialize filing cache
+        if args.offline and args.no_cache:
+            raise ValueError("Offline mode requires the filing cache")
+        self.offline = args.offline
+        self.cache = None if args.no_cache else FilingCache(SEC_CACHE_DIR, int(SEC_CACHE_MAX_MB * 1024 ** 2))
+
+        # Initialize ticker resolver, the CIK map is only downloaded when a ticker needs it
+        self.resolver = CIKResolver(
+            CIK_MAP_PATH, CIK_MAP_TTL_HOURS * 3600,
+            lambda: self._make_sec_request("https://www.sec.gov/files/company_tickers.json").json(),
+            offline=self.offline
+        )
 
         # Initialize BaseScraper
         output_path = Path(args.s) if args.s else LINK
@@ -36,6 +71,13 @@ class SECScraper(BaseScraper):
             save_mode = 'append'
         super().__init__(output_path, save_mode)
 
+        # Incremental mode
+        if args.incremental and save_mode == 'rewrite':
+            raise ValueError("Incremental mode cannot be combined with rewrite")
+        self.incremental = args.incremental
+        self.known_accessions = set()
+        self.resume = args.resume
+
         self.ciks = self._process_input(args)
 
     def close_session(self):
@@ -48,7 +90,7 @@ class SECScraper(BaseScraper):
 
         # Process file input
         if args.f:
-            ciks += self._tickers_from_file(Path(args.f))
+            ciks += self._tickers_to_ciks(self._tickers_from_file(Path(args.f)))
 
         # Process command line tickers
         if args.tickers:
@@ -56,22 +98,87 @@ class SECScraper(BaseScraper):
 
         return list(set(ciks))  # Remove duplicates
 
-    def _make_sec_request(self, url: str, retries: int = 3) -> requests.Response:
-        """Make SEC request with rate limiting and retries"""
-        for attempt in range(retries):
-            elapsed = (dt.datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < SEC_REQUEST_DELAY:
-                time.sleep(SEC_REQUEST_DELAY - elapsed)
+    def _cache_lookup(self, url: str, cache_key: Optional[str], refresh: bool) -> Optional[str]:
+        """Return cached document if it may be used instead of the network"""
+        if self.cache and cache_key and (self.offline or not refresh):
+            text = self.cache.get(cache_key)
+            if text is not None:
+                return text
+
+        if self.offline:
+            raise RuntimeError(f"{url} is not cached (offline mode)")
+        return None
+
+    def _cache_store(self, cache_key: Optional[str], text: str):
+        """Store fetched document in the cache"""
+        if self.cache and cache_key:
+            self.cache.put(cache_key, text)
+
+    @staticmethod
+    def _cached_response(url: str, text: str) -> requests.Response:
+        """Wrap cached document in a response object"""
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response.encoding = 'utf-8'
+        response._content = text.encode('utf-8')
+        return response
+
+    @staticmethod
+    def _is_throttled(status: int, text: str) -> bool:
+        """Check if SEC refused the request because of its rate limit"""
+        return status == 429 or "Request Rate Threshold Exceeded" in text
+
+    def _sec_get(self, url: str) -> requests.Response:
+        """GET under the adaptive rate limit, re-queueing throttled requests instead of failing them"""
+        for throttled in range(SEC_THROTTLE_RETRIES):
+            self.limiter.acquire_blocking()
+            response = self.session.get(url, timeout=5)
+            if not self._is_throttled(response.status_code, response.text):
+                self.limiter.on_success()
+                return response
+
+            self.limiter.on_throttle()
+            logger.warning(f"SEC rate limit exceeded, requeued {url} ({throttled + 1}/{SEC_THROTTLE_RETRIES})")
+
+        logger.error("SEC rate limit exceeded")
+        raise RuntimeError("SEC rate limit exceeded")
+
+    async def _sec_get_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> str:
+        """Async GET under the adaptive rate limit, re-queueing throttled requests instead of failing them"""
+        for throttled in range(SEC_THROTTLE_RETRIES):
+            async with semaphore:
+                await self.limiter.acquire()
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    text = await response.text()
+                    if not self._is_throttled(response.status, text):
+                        self.limiter.on_success()
+                        response.raise_for_status()
+                        return text
+
+            self.limiter.on_throttle()
+            logger.warning(f"SEC rate limit exceeded, requeued {url} ({throttled + 1}/{SEC_THROTTLE_RETRIES})")
+
+        logger.error("SEC rate limit exceeded")
+        raise RuntimeError("SEC rate limit exceeded")
+
+    def _make_sec_request(self, url: str, retries: int = 3, cache_key: Optional[str] = None,
+                          refresh: bool = False) -> requests.Response:
+        """Make SEC request with caching, rate limiting and retries
+
+        Documents with a cache_key are served from the cache when present. With refresh set,
+        the cached copy is only used in offline mode and is replaced after every fetch.
+        """
+        cached = self._cache_lookup(url, cache_key, refresh)
+        if cached is not None:
+            return self._cached_response(url, cached)
 
+        for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=5)
+                response = self._sec_get(url)
                 response.raise_for_status()
 
-                if "Request Rate Threshold Exceeded" in response.text:
-                    logger.error("SEC rate limit exceeded")
-                    raise RuntimeError("SEC rate limit exceeded")
-
-                self.last_request_time = dt.datetime.now()
+                self._cache_store(cache_key, response.text)
                 return response
 
             except requests.exceptions.HTTPError as e:
@@ -96,15 +203,44 @@ class SECScraper(BaseScraper):
                 logger.error(f"Request failed: {str(e)}")
                 raise
 
+    async def _make_sec_request_async(self, session: aiohttp.ClientSession,
+                                      semaphore: asyncio.Semaphore, url: str, retries: int = 3,
+                                      cache_key: Optional[str] = None, refresh: bool = False) -> str:
+        """Make SEC request under the shared token bucket, with the same caching and retries as the sync path"""
+        cached = self._cache_lookup(url, cache_key, refresh)
+        if cached is not None:
+            return cached
+
+        for attempt in range(retries):
+            try:
+                text = await self._sec_get_async(session, semaphore, url)
+                self._cache_store(cache_key, text)
+                return text
+
+            except aiohttp.ClientResponseError as e:
+                if 500 <= e.status < 600 and attempt < retries - 1:  # Retry all server side errors
+                    wait = 2 ** attempt
+                    logger.warning(f"Retrying ({attempt + 1}/{retries}), {str(e)}")
+                    await asyncio.sleep(wait)
+                else:
+                    logger.error(f"Request failed after {retries} retries: {str(e)}")
+                    raise
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt < retries - 1:  # Retry network errors
+                    wait = 2 ** attempt
+                    logger.warning(f"Retrying ({attempt + 1}/{retries})")
+                    await asyncio.sleep(wait)
+                else:
+                    logger.error(f"Network error after {retries} retries: {str(e)}")
+                    raise
+
+            except aiohttp.ClientError as e:
+                logger.error(f"Request failed: {str(e)}")
+                raise
+
     def _tickers_to_ciks(self, tickers: List[str]) -> List[str]:
         """Convert tickers to CIK numbers"""
-        try:
-            response = self._make_sec_request("https://www.sec.gov/files/company_tickers.json")
-            cik_map = response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch CIK map: {str(e)}")
-            return []
-
         ciks = []
         for ticker in tickers:
             ticker = ticker.strip().upper()
@@ -114,249 +250,374 @@ class SECScraper(BaseScraper):
                 ciks.append(ticker.zfill(10))
                 continue
 
-            # Search for ticker in SEC data
-            found = False
-            for entry in cik_map.values():
-                if entry.get('ticker') == ticker:
-                    ciks.append(str(entry['cik_str']).zfill(10))
-                    found = True
-                    break
+            try:
+                cik = self.resolver.to_cik(ticker)
+            except Exception as e:
+                logger.error(f"Failed to fetch CIK map: {str(e)}")
+                continue
 
-            if not found:
+            if cik:
+                ciks.append(cik)
+            else:
                 logger.warning(f"Could not find CIK for ticker: {ticker}")
 
         return ciks
 
     @staticmethod
-    def _normalize_name(name: str) -> str:
-        """Normalize insider name formatting"""
-        words = []
-        for word in name.split():
-            if '-' in word:
-                word = '-'.join([p.capitalize() for p in word.split('-')])
-            else:
-                word = word.capitalize()
+    def _filing_url(accession_number: str, cik: str) -> str:
+        """Build URL of the full text submission of a filing"""
+        return f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number.replace('-', '')}/{accession_number}.txt"
+
+    def _process_filing(self, accession_number: str, cik: str) -> Optional[List[Dict]]:
+        """Process single SEC filing, None if it couldn't be retrieved or parsed"""
+        try:
+            response = self._make_sec_request(self._filing_url(accession_number, cik), cache_key=accession_number)
+        except Exception as e:
+            logger.warning(f"Failed to retrieve filing {accession_number}: {str(e)}")
+            return None
 
-            if word.lower().startswith('mc') and len(word) > 2:
-                word = word[:2] + word[2].upper() + word[3:].lower()
+        return self._parse_filing(response.text, accession_number)
 
-            words.append(word)
+    async def _process_filing_async(self, session: aiohttp.ClientSession,
+                                    semaphore: asyncio.Semaphore, accession_number: str,
+                                    cik: str) -> Optional[List[Dict]]:
+        """Process single SEC filing in async mode, None if it couldn't be retrieved or parsed"""
+        try:
+            text = await self._make_sec_request_async(
+                session, semaphore, self._filing_url(accession_number, cik), cache_key=accession_number
+            )
+        except Exception as e:
+            logger.warning(f"Failed to retrieve filing {accession_number}: {str(e)}")
+            return None
 
-        return ' '.join(words)
+        return self._parse_filing(text, accession_number)
 
-    @staticmethod
-    def _custom_round(number: float, precision: int = 0) -> float:
-        """Custom rounding function, rounding away from zero when the rounding part is exactly in the middle"""
-        factor = 10 ** precision
-        scaled = number * factor
-        decimal = scaled - int(scaled)
-
-        if abs(decimal) == 0.5:
-            scaled = int(scaled) + (1 if scaled > 0 else -1)
-        else:
-            scaled = round(scaled)
-
-        return (scaled / factor) if precision != 0 else int(scaled)
-
-    def _combine_transactions(self, transactions: List[Dict]) -> List[Dict]:
-        """Combine transactions in the same filing occurring on adjacent or the same date"""
-        # Grouping
-        grouped = {}
-        for trans in transactions:
-            key = (trans['Trade Type'], trans['A_D'])
-            if not self.comb_adj_dates:
-                key += (trans['Trade Date'],)
-
-            if key not in grouped:
-                grouped[key] = []
-            grouped[key].append(trans)
-
-        # Combining
-        combined = []
-        for key, group in grouped.items():
-            total_qty = sum(t['Qty'] for t in group)
-            total_value = sum(float(t['Price']) * abs(t['Qty']) for t in group)
-            avg_price = total_value / abs(total_qty) if total_qty != 0 else 0
-
-            combined.append({
-                'X': group[0]['X'] + 'M' if len(group) > 1 else group[0]['X'],
-                'Filing Date': group[0]['Filing Date'],
-                'Trade Date': min(t['Trade Date'] for t in group),
-                'Ticker': group[0]['Ticker'],
-                'Insider Name': group[0]['Insider Name'],
-                'Title': group[0]['Title'],
-                'Trade Type': group[0]['Trade Type'],
-                'Price': self._custom_round(avg_price, 2),
-                'Qty': total_qty,
-                'Value': int(self._custom_round(total_value)),
-                'FC': group[0]['FC']
-            })
-
-        return combined
-
-    def _process_filing(self, accession_number: str, cik: str) -> pd.DataFrame:
-        """Process single SEC filing"""
-        url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number.replace('-', '')}/{accession_number}.txt"
+    def _parse_filing(self, text: str, accession_number: str) -> Optional[List[Dict]]:
+        """Parse full text submission of a Form 4 filing into output records, None if it can't be parsed"""
+        transactions = self._parse_transactions(text, accession_number)
+        if not transactions:
+            return transactions
+
+        return self._combine_transactions(transactions)
+
+    @classmethod
+    def _parse_transactions(cls, text: str, accession_number: str) -> Optional[List[Dict]]:
+        """Parse full text submission of a Form 4 filing into uncombined transactions
 
+        Returns None when the document can't be parsed, so its CIK isn't journaled as finished.
+        Uses no scraper state, so it can run in a separate process.
+        """
         try:
-            response = self._make_sec_request(url)
-            soup = BeautifulSoup(response.text, 'xml')
+            document = Form4Document(text)
         except Exception as e:
-            logger.warning(f"Failed to retrieve filing {accession_number}: {str(e)}")
-            return pd.DataFrame()
+            logger.warning(f"Failed to parse filing {accession_number}: {str(e)}")
+            return None
 
         # Extract common filing information
         try:
             filing_data = {
-                'X': 'D' if soup.find('derivativeTable') else '',
-                'Filing Date': dt.datetime.strptime(
-                    re.search(r"<ACCEPTANCE-DATETIME>(\d+)", response.text).group(1),
-                    "%Y%m%d%H%M%S"
-                ),
-                'Ticker': soup.find('issuerTradingSymbol').text,
-                'Insider Name': self._normalize_name(soup.find('rptOwnerName').text),
-                'Title': self._extract_title(soup),
+                'X': 'D' if document.has_derivative_table else '',
+                'Filing Date': document.filing_date(),
+                'Ticker': document.first_text('issuerTradingSymbol'),
+                'Insider Name': cls._normalize_name(document.first_text('rptOwnerName')),
+                'Title': cls._extract_title(document),
                 'FC': accession_number
             }
         except AttributeError as e:
             logger.warning(f"Missing required filing data in {accession_number}: {str(e)}")
-            return pd.DataFrame()
+            return []
         except Exception as e:
             logger.error(f"Unexpected error parsing {accession_number}: {str(e)}")
-            return pd.DataFrame()
+            return None
 
         # Process non-derivative transactions
         transactions = []
-        for transaction in soup.find_all('nonDerivativeTransaction'):
+        for transaction in document.get_transactions('nonDerivativeTransaction'):
             try:
-                transactions.append(self._parse_transaction(transaction, filing_data))
+                transactions.append(cls._parse_transaction(transaction, filing_data))
             except Exception as e:
                 logger.warning(f"Failed to parse non-derivative transaction: {str(e)}")
 
         # Process derivative transactions
-        for transaction in soup.find_all('derivativeTransaction'):
+        for transaction in document.get_transactions('derivativeTransaction'):
             try:
-                transactions.append(self._parse_transaction(transaction, filing_data))
+                transactions.append(cls._parse_transaction(transaction, filing_data))
             except Exception as e:
                 logger.warning(f"Failed to parse derivative transaction: {str(e)}")
 
-        if not transactions:
-            return pd.DataFrame()
-
-        return pd.DataFrame(self._combine_transactions(transactions))
+        return transactions
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _extract_title(document: Form4Document) -> str:
         """Extract and format insider title"""
-        relationship = soup.find('reportingOwnerRelationship')
-        title_parts = []
-
-        if relationship.find('isOfficer', string=lambda x: x in ['true', '1']):
-            title = relationship.find('officerTitle')
-            title_text = title.string if title else 'See Remarks'
-            if 'See Remarks' in title_text and soup.find('remarks'):
-                title_text = soup.find('remarks').string
-            title_parts.append(title_text)
-
-        if relationship.find('isDirector', string=lambda x: x in ['true', '1']):
-            title_parts.append('Director')
-
-        if relationship.find('isTenPercentOwner', string=lambda x: x in ['true', '1']):
-            title_parts.append('10% Owner')
-
-        return ', '.join(title_parts) if title_parts else 'No Title'
-
-    def _parse_transaction(self, transaction: BeautifulSoup, filing_data: Dict) -> Dict:
-        """Parse individual transaction data"""
-        try:
-            price_elem = transaction.find('transactionPricePerShare')
-            price = float(price_elem.value.text) if price_elem else 0.0
-        except (AttributeError, ValueError):
-            price = 0.0
-
-        try:
-            qty_elem = transaction.find('transactionShares')
-            qty = int(qty_elem.value.text) if qty_elem else 0
-        except (AttributeError, ValueError):
-            qty = 0
-
+        relationship = document.get_relationship()
+        return format_title(
+            relationship['isOfficer'], relationship['officerTitle'], document.remarks,
+            relationship['isDirector'], relationship['isTenPercentOwner']
+        )
+
+    def _get_filings(self, cik: str) -> Optional[List[str]]:
+        """Retrieve list of Form 4 filings for a CIK, None if it couldn't be retrieved"""
         try:
-            code = transaction.find('transactionAcquiredDisposedCode').value.text
-        except AttributeError:
-            code = ''
-
-        return {
-            **filing_data,
-            'Trade Date': pd.to_datetime(transaction.find('transactionDate').value.text).date(),
-            'Trade Type': self._trade_type(transaction.find('transactionCode').text),
-            'Price': price,
-            'Qty': qty * (-1 if code == 'D' else 1),
-            'A_D': code
-        }
+            response = self._make_sec_request(self._submissions_url(cik), cache_key=f"CIK{cik}", refresh=True)
+            return self._form4_accessions(response.json())
+        except Exception as e:
+            logger.error(f"Failed to get filings for CIK {cik}: {str(e)}")
+            return None
 
-    @staticmethod
-    def _trade_type(code: str) -> str:
-        """Map transaction codes to openinsider format"""
-        types = {
-            'P': 'Purchase',
-            'S': 'Sale',
-            'A': 'Grant',
-            'D': 'Sale to Iss',
-            'G': 'Gift',
-            'F': 'Tax',
-            'M': 'OptEx',
-            'X': 'OptEx',
-            'C': 'Cnv Deriv',
-            'W': 'Inherited'
-        }
-        return f"{code} - {types.get(code, 'Unknown')}"
-
-    def _get_filings(self, cik: str) -> List[str]:
-        """Retrieve list of Form 4 filings for a CIK"""
+    async def _get_filings_async(self, session: aiohttp.ClientSession,
+                                 semaphore: asyncio.Semaphore, cik: str) -> Optional[List[str]]:
+        """Retrieve list of Form 4 filings for a CIK in async mode, None if it couldn't be retrieved"""
         try:
-            response = self._make_sec_request(f"https://data.sec.gov/submissions/CIK{cik}.json")
-            data = response.json()
-            return [
-                acc for acc, form in zip(
-                    data['filings']['recent']['accessionNumber'],
-                    data['filings']['recent']['form']
-                ) if form == '4'
-            ]
+            text = await self._make_sec_request_async(
+                session, semaphore, self._submissions_url(cik), cache_key=f"CIK{cik}", refresh=True
+            )
+            return self._form4_accessions(json.loads(text))
         except Exception as e:
             logger.error(f"Failed to get filings for CIK {cik}: {str(e)}")
-            return []
+            return None
 
-    def _process_cik_filings(self, cik: str, accession_numbers: List[str]) -> pd.DataFrame:
-        """Processe all filings for a single CIK"""
-        df = pd.DataFrame(columns=COLUMNS)
-        for i, accession_number in enumerate(accession_numbers):
-            if self.filing_limit != -1 and i >= self.filing_limit:
-                break
+    @staticmethod
+    def _submissions_url(cik: str) -> str:
+        """Build URL of the submissions JSON for a CIK"""
+        return f"https://data.sec.gov/submissions/CIK{cik}.json"
+
+    @staticmethod
+    def _form4_accessions(data: Dict) -> List[str]:
+        """Extract Form 4 accession numbers from submissions JSON"""
+        return [
+            acc for acc, form in zip(
+                data['filings']['recent']['accessionNumber'],
+                data['filings']['recent']['form']
+            ) if form == '4'
+        ]
+
+    def _select_filings(self, cik: str, accession_numbers: List[str]) -> List[str]:
+        """Apply filing limit and skip filings already stored in incremental mode"""
+        if self.filing_limit != -1:
+            accession_numbers = accession_numbers[:self.filing_limit]
+
+        if self.incremental:
+            new = [acc for acc in accession_numbers if acc not in self.known_accessions]
+            logger.info(f"CIK {cik}: {len(new)} new of {len(accession_numbers)} filings")
+            return new
+
+        return accession_numbers
+
+    def _process_cik_filings(self, cik: str, accession_numbers: List[str], records: RecordBuffer) -> int:
+        """Processe all filings for a single CIK, return number of filings that failed"""
+        failed = 0
+        for accession_number in self._select_filings(cik, accession_numbers):
             try:
-                df = pd.concat([df, self._process_filing(accession_number, cik)])
+                filing_records = self._process_filing(accession_number, cik)
             except Exception as e:
                 logger.warning(f"Skipping filing {accession_number}: {str(e)}")
-        return df
+                filing_records = None
+            if filing_records is None:
+                failed += 1
+            else:
+                records.extend(filing_records)
+        return failed
+
+    def _journal_cik(self, cik: str, records: pd.DataFrame, failed: int):
+        """Journal a CIK as finished only if all its filings went through, so a resumed run retries it"""
+        if failed:
+            logger.warning(f"CIK {cik}: {failed} filings failed, it will be scraped again when resuming")
+            return
+        self.journal.record(cik, records)
+
+    async def _process_cik_async(self, session: aiohttp.ClientSession,
+                                 semaphore: asyncio.Semaphore, cik: str) -> List[Dict]:
+        """Process all filings for a single CIK concurrently"""
+        logger.info(f"Processing CIK: {cik}")
+        accession_numbers = await self._get_filings_async(session, semaphore, cik)
+        if accession_numbers is None:
+            return []
+        filings = self._select_filings(cik, accession_numbers)
+
+        results = await asyncio.gather(
+            *(self._process_filing_async(session, semaphore, acc, cik) for acc in filings),
+            return_exceptions=True
+        )
+
+        records = []
+        failed = 0
+        for accession_number, result in zip(filings, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Skipping filing {accession_number}: {str(result)}")
+                failed += 1
+            elif result is None:
+                failed += 1
+            else:
+                records += result
 
-    def scrape(self) -> pd.DataFrame:
-        """Main scraping controller"""
-        df = pd.DataFrame(columns=COLUMNS)
+        self._journal_cik(cik, pd.DataFrame(records, columns=COLUMNS), failed)
+        return records
 
-        for cik in self.ciks:
-            try:
-                logger.info(f"Processing CIK: {cik}")
-                filings = self._get_filings(cik)
-                data = self._process_cik_filings(cik, filings)
-                df = pd.concat([df, data])
-            except Exception as e:
-                logger.error(f"Failed to process CIK {cik}: {str(e)}")
+    async def _scrape_async(self, ciks: List[str]) -> pd.DataFrame:
+        """Async scraping controller keeping many requests in flight under one rate limit"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+
+        logger.info(f"Scraping {len(ciks)} CIKs at up to {self.max_rate} req/s "
+                    f"with {self.concurrency} requests in flight")
+
+        async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}, connector=connector) as session:
+            results = await asyncio.gather(
+                *(self._process_cik_async(session, semaphore, cik) for cik in ciks),
+                return_exceptions=True
+            )
 
-        return df
+        records = RecordBuffer()
+        for cik, result in zip(ciks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to process CIK {cik}: {str(result)}")
+            else:
+                records.extend(result)
+        return records.to_frame()
+
+    async def _scrape_pipelined(self, ciks: List[str]) -> pd.DataFrame:
+        """Pipelined scraping controller
+
+        Fetching under the rate limit, parsing in a process pool and combining run as
+        concurrent stages connected by bounded queues, so parsing overlaps network waits.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        fetch_slots = asyncio.Semaphore(self.concurrency)  # Bounds fetched texts waiting for the queue
+        fetched = asyncio.Queue(maxsize=SEC_QUEUE_SIZE)
+        parsed = asyncio.Queue(maxsize=SEC_QUEUE_SIZE)
+        records = RecordBuffer()
+        loop = asyncio.get_running_loop()
+
+        # Per CIK progress, a CIK is finished once all its queued filings went through combining
+        queued = dict.fromkeys(ciks, 0)
+        combined = dict.fromkeys(ciks, 0)
+        failed = dict.fromkeys(ciks, 0)  # Filings that couldn't be fetched or parsed
+        cik_records = {cik: [] for cik in ciks}
+        listed = set()
+
+        def finish_if_done(cik: str):
+            if cik in listed and combined[cik] == queued[cik]:
+                self._journal_cik(cik, pd.DataFrame(cik_records.pop(cik), columns=COLUMNS), failed[cik])
+                listed.discard(cik)
+
+        logger.info(f"Scraping {len(ciks)} CIKs at up to {self.max_rate} req/s "
+                    f"with {self.concurrency} requests in flight and {self.parse_workers} parser processes")
+
+        async def fetch_filing(session: aiohttp.ClientSession, accession_number: str, cik: str):
+            async with fetch_slots:
+                try:
+                    text = await self._make_sec_request_async(
+                        session, semaphore, self._filing_url(accession_number, cik),
+                        cache_key=accession_number
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to retrieve filing {accession_number}: {str(e)}")
+                    failed[cik] += 1
+                    return
+                queued[cik] += 1
+                await fetched.put((cik, accession_number, text))
+
+        async def fetch_cik(session: aiohttp.ClientSession, cik: str):
+            logger.info(f"Processing CIK: {cik}")
+            accession_numbers = await self._get_filings_async(session, semaphore, cik)
+            if accession_numbers is None:  # Never listed, so never journaled
+                return
+            filings = self._select_filings(cik, accession_numbers)
+            await asyncio.gather(*(fetch_filing(session, acc, cik) for acc in filings))
+            listed.add(cik)
+            finish_if_done(cik)
+
+        async def parse_stage(pool: ProcessPoolExecutor):
+            while (item := await fetched.get()) is not None:
+                cik, accession_number, text = item
+                try:
+                    transactions = await loop.run_in_executor(
+                        pool, self._parse_transactions, text, accession_number
+                    )
+                except Exception as e:
+                    logger.warning(f"Skipping filing {accession_number}: {str(e)}")
+                    transactions = None
+                await parsed.put((cik, transactions))  # Passed on even when empty or failed to count the filing as done
+
+        async def combine_stage():
+            while (item := await parsed.get()) is not None:
+                cik, transactions = item
+                if transactions is None:
+                    failed[cik] += 1
+                elif transactions:
+                    combined_records = self._combine_transactions(transactions)
+                    records.extend(combined_records)
+                    cik_records[cik] += combined_records
+                combined[cik] += 1
+                finish_if_done(cik)
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            parsers = [asyncio.create_task(parse_stage(pool)) for _ in range(self.parse_workers)]
+            combiner = asyncio.create_task(combine_stage())
+
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}, connector=connector) as session:
+                results = await asyncio.gather(
+                    *(fetch_cik(session, cik) for cik in ciks), return_exceptions=True
+                )
+            for cik, result in zip(ciks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to process CIK {cik}: {str(result)}")
+
+            # Drain the stages in order
+            for _ in parsers:
+                await fetched.put(None)
+            await asyncio.gather(*parsers)
+            await parsed.put(None)
+            await combiner
+
+        return records.to_frame()
+
+    def scrape(self) -> pd.DataFrame:
+        """Main scraping controller"""
+        if self.incremental:
+            self.known_accessions = self.load_existing_accessions()
+            logger.info(f"Found {len(self.known_accessions)} stored filings")
+
+        # Finished CIKs are journaled as they complete, so an interrupted run can be resumed
+        self.journal = ProgressJournal(ProgressJournal.path_for(self.output_path))
+        completed = self.journal.start(self.resume)
+        ciks = [cik for cik in self.ciks if cik not in completed]
+
+        records = RecordBuffer()
+        if len(ciks) < len(self.ciks):
+            records.add_frame(self.journal.load(set(self.ciks) & completed))
+
+        if self.pipeline:
+            records.add_frame(asyncio.run(self._scrape_pipelined(ciks)))
+        elif self.use_async:
+            records.add_frame(asyncio.run(self._scrape_async(ciks)))
+        else:
+            for cik in ciks:
+                try:
+                    logger.info(f"Processing CIK: {cik}")
+                    filings = self._get_filings(cik)
+                    if filings is None:
+                        continue
+                    cik_records = RecordBuffer()
+                    failed = self._process_cik_filings(cik, filings, cik_records)
+                    df = cik_records.to_frame()
+                    self._journal_cik(cik, df, failed)
+                    records.add_frame(df)
+                except Exception as e:
+                    logger.error(f"Failed to process CIK {cik}: {str(e)}")
+
+        self.journal.note_unfinished(self.ciks)
+        logger.info(f"SEC requests: {self.limiter.summary()}")
+        return self._standardize_types(records.to_frame())
 
 
 def main():
     parser = get_sec_parser()
     args = parser.parse_args()
 
+    scraper = None  # Flag validation in the constructor can fail before it's assigned
     try:
         scraper = SECScraper(args)
         df = scraper.scrape()
@@ -7,6 +7,34 @@ def get_sec_parser():
     parser.add_argument('-s', type=str, help='Output file path')
     parser.add_argument('-d', action='store_true', help='Disable date combining')
     parser.add_argument('-l', type=int, help='Filing limit per ticker')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Fetch filings concurrently under a shared rate limit')
+    parser.add_argument('--rate', type=float, help='Target requests per second in async mode')
+    parser.add_argument('--concurrency', type=int, help='Max requests in flight in async mode')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Fetch, parse and combine filings in concurrent stages (implies --async)')
+    parser.add_argument('--parse-workers', type=int, help='Parser processes in pipeline mode')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help='Skip filings whose accession number is already stored')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the on-disk filing cache')
+    parser.add_argument('--offline', action='store_true',
+                        help='Use only cached SEC documents, never the network')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run, skipping CIKs it already finished')
+
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-a', '--append', action='store_true',
+                      help='Append new data without deduplication')
+    group.add_argument('-r', '--rewrite', action='store_true',
+                      help='Delete existing file and write fresh data')
+    return parser
+
+def get_sec_bulk_parser():
+    parser = argparse.ArgumentParser(description='SEC Insider Transaction Data Set Ingest')
+    parser.add_argument('archives', nargs='+', help='Quarterly data set ZIP files or folders')
+    parser.add_argument('-t', '--tickers', nargs='+', help='Only ingest these tickers')
+    parser.add_argument('-s', type=str, help='Output file path')
+    parser.add_argument('-d', action='store_true', help='Disable date combining')
 
     group = parser.add_mutually_exclusive_group()
     group.add_argument('-a', '--append', action='store_true',
@@ -21,6 +49,21 @@ def get_openinsider_parser():
     parser.add_argument('-f', type=str, help='File with tickers')
     parser.add_argument('-s', type=str, help='Output file path')
     parser.add_argument('-n', '--processes', type=int, help='Number of processes to use')
+    parser.add_argument('--market', action='store_true',
+                        help='Scrape trades of all tickers in a date window, tickers only filter the result')
+    parser.add_argument('-sd', type=str, help='Market mode window start date (YYYY-MM-DD)')
+    parser.add_argument('-ed', type=str, help='Market mode window end date (YYYY-MM-DD), default today')
+    parser.add_argument('--trade-dates', action='store_true',
+                        help='Apply the market mode window to trade dates instead of filing dates')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Fetch pages concurrently with one pooled client instead of processes')
+    parser.add_argument('--rate', type=float, help='Max requests per second in async mode')
+    parser.add_argument('--concurrency', type=int, help='Max requests in flight in async mode')
+    parser.add_argument('--parse-workers', type=int, help='Page parser processes in async mode')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write results to the output (.csv or .db) in batches while scraping')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run, skipping tickers it already finished')
 
     group = parser.add_mutually_exclusive_group()
     group.add_argument('-a', '--append', action='store_true',
@@ -31,8 +74,16 @@ def get_openinsider_parser():
 
 def get_visualizer_parser():
     parser = argparse.ArgumentParser(description='Trading Data Visualizer')
-    parser.add_argument('ticker', type=str, help='Stock ticker symbol')
+    parser.add_argument('tickers', nargs='*', help='Stock ticker symbols, several are rendered to files')
+    parser.add_argument('-f', type=str, help='File with tickers to render to files')
+    parser.add_argument('-o', type=str, help='Folder for rendered charts, enables batch mode')
+    parser.add_argument('--format', choices=['png', 'svg'], default='png', help='Rendered chart format')
+    parser.add_argument('-n', '--processes', type=int, help='Number of rendering processes in batch mode')
     parser.add_argument('-sd', type=str, help='Start date (YYYY-MM-DD)')
     parser.add_argument('-ed', type=str, help='End date (YYYY-MM-DD)')
     parser.add_argument('-s', type=str, help='Scraped data file path')
+    parser.add_argument('--offline', action='store_true',
+                        help='Use only cached prices, without fetching missing dates')
+    parser.add_argument('--prices', type=str,
+                        help='Folder with <TICKER>.csv daily prices to use instead of Yahoo Finance')
     return parser
\ No newline at end of file
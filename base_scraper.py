@@ -1,24 +1,104 @@
 import sqlite3
+import datetime as dt
 import pandas as pd
 import logging
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
 from settings import CSV_SEP
+from parquet_store import ParquetStore
+from fingerprint_index import FingerprintIndex, fingerprints
+from schema import COLUMNS, KEY_COLUMNS, apply_schema
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-COLUMNS = [
-    'X', 'Filing Date', 'Trade Date', 'Ticker', 'Insider Name', 'Title',
-    'Trade Type', 'Price', 'Qty', 'Value', 'FC'
+DB_TYPES = {  # SQLite column types of the transactions table
+    'X': 'TEXT', 'Filing Date': 'TIMESTAMP', 'Trade Date': 'DATE', 'Ticker': 'TEXT',
+    'Insider Name': 'TEXT', 'Title': 'TEXT', 'Trade Type': 'TEXT',
+    'Price': 'REAL', 'Qty': 'INTEGER', 'Value': 'REAL', 'FC': 'TEXT'
+}
+# Missing values are indexed as '' so they compare equal in key lookups. Trade dates are
+# compared without the midnight time part pandas adds when writing datetime columns.
+DB_KEY_EXPRESSIONS = [
+    f"""IFNULL(substr("{column}", 1, 10), '')""" if column == 'Trade Date' else f"""IFNULL("{column}", '')"""
+    for column in KEY_COLUMNS
 ]
+DB_KEY = ', '.join(DB_KEY_EXPRESSIONS)
+DB_KEY_MATCH = ' AND '.join(f"{expression} = ?" for expression in DB_KEY_EXPRESSIONS)
+DB_KEY_POSITIONS = [COLUMNS.index(column) for column in KEY_COLUMNS]
+DB_TICKER_INDEX = 'CREATE INDEX IF NOT EXISTS transactions_ticker ON transactions ("Ticker", "Filing Date")'
+
+FILTER_COLUMNS = ['Ticker', 'Trade Type', 'Filing Date']  # Read along with the requested columns to filter on
+# Every column stays text until the matching records are typed, so stray values such as a
+# repeated header from an append become missing instead of failing the whole read
+READ_DTYPES = dict.fromkeys(COLUMNS, str)
+LOAD_CHUNK_ROWS = 200_000  # CSV rows read at once when loading existing data
+
+
+class RecordBuffer:
+    """Column-wise accumulator of output records, turned into a DataFrame only once
+
+    Records go to plain column lists and ready-made frames are kept as chunks, so the
+    rows are copied once in to_frame instead of on every pd.concat.
+    """
+
+    def __init__(self, columns: List[str] = COLUMNS):
+        self.columns = list(columns)
+        self._frames = []
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self._data = {column: [] for column in self.columns}
+        self._rows = 0
+
+    def _flush(self):
+        """Move pending records into a frame chunk"""
+        if self._rows:
+            self._frames.append(pd.DataFrame(self._data, columns=self.columns))
+            self._reset_columns()
+
+    def append(self, record: Dict):
+        """Add a single record, missing columns are stored as None"""
+        for column in self.columns:
+            self._data[column].append(record.get(column))
+        self._rows += 1
+
+    def extend(self, records: Iterable[Dict]):
+        """Add several records"""
+        for record in records:
+            self.append(record)
+
+    def add_frame(self, df: pd.DataFrame):
+        """Add an already built frame without copying it until to_frame"""
+        if df is None or df.empty:
+            return
+        self._flush()  # Keep insertion order
+        self._frames.append(df.reindex(columns=self.columns))
+
+    def __len__(self) -> int:
+        return self._rows + sum(len(df) for df in self._frames)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the final DataFrame"""
+        self._flush()
+        if not self._frames:
+            return pd.DataFrame(columns=self.columns)
+        if len(self._frames) == 1:
+            return self._frames[0].reset_index(drop=True)
+        return pd.concat(self._frames, ignore_index=True)
 
 
 class BaseScraper:
     def __init__(self, output_path: Path, save_mode: str):
         self.output_path = output_path
         self.save_mode = save_mode
+        self.journal = None  # Progress journal of a resumable scrape, removed once a clean run is saved
+
+    @staticmethod
+    def _standardize_types(df: pd.DataFrame) -> pd.DataFrame:
+        """Ensure expected columns exist and have the schema's data types"""
+        return apply_schema(df)
 
     def _tickers_from_file(self, path: Path) -> List[str]:
         """Load tickers from text file"""
@@ -28,67 +108,265 @@ class BaseScraper:
         with open(path, 'r') as f:
             return [line.strip() for line in f if line.strip()]
 
-    def load_existing_data(self) -> pd.DataFrame:
-        """Load existing scraped data and ensure consistent formatting"""
+    def load_existing_data(self, tickers: Optional[Iterable[str]] = None, start: Optional[dt.datetime] = None,
+                           end: Optional[dt.datetime] = None, trade_types: Optional[Iterable[str]] = None,
+                           columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load existing scraped data and ensure consistent formatting
+
+        Optional filters keep only the given tickers and trade types filed between start
+        and end, and only the given columns. They are applied while reading: Parquet
+        datasets push them down to the partitions, SQLite queries go through the ticker
+        index and CSV files are read in chunks of the needed columns, so only matching
+        rows get typed.
+        """
+        columns = list(columns) if columns else COLUMNS
         if not self.output_path.exists():
-            return pd.DataFrame(columns=COLUMNS)
+            return apply_schema(pd.DataFrame(), columns)
 
         suffix = self.output_path.suffix.lower()
 
         try:
+            if suffix == '.parquet':  # Types are stored in the files
+                df = ParquetStore(self.output_path).read(tickers, start, end, trade_types, columns)
+                return apply_schema(df, columns)
+
             if suffix == '.db':
-                with sqlite3.connect(self.output_path) as conn:
-                    df = pd.read_sql("SELECT * FROM transactions", conn)
+                df = self._query_db(columns, tickers, start, end, trade_types)
             elif suffix == '.csv':
-                df = pd.read_csv(self.output_path, sep=CSV_SEP)
+                df = self._read_csv_filtered(columns, tickers, start, end, trade_types)
             elif suffix == '.xlsx':
-                df = pd.read_excel(self.output_path)
+                needed = set(columns) | set(FILTER_COLUMNS)
+                df = pd.read_excel(self.output_path, usecols=lambda column: column in needed, dtype=READ_DTYPES)
+                df = self._filter_records(df, tickers, start, end, trade_types)
             else:
                 raise ValueError(f"Unsupported format: {self.output_path.suffix}")
 
-            # Ensure expected columns exist
-            df = df.reindex(columns=COLUMNS, fill_value=pd.NA)
+            return apply_schema(df, columns)
+
+        except Exception as e:
+            logger.error(f"Critical error loading {self.output_path}: {str(e)}")
+            raise
+
+    def _query_db(self, columns: List[str], tickers: Optional[Iterable[str]], start: Optional[dt.datetime],
+                  end: Optional[dt.datetime], trade_types: Optional[Iterable[str]]) -> pd.DataFrame:
+        """Select the columns of matching records with a parameterized query"""
+        conditions = []
+        params = []
+        for column, values in (('Ticker', tickers), ('Trade Type', trade_types)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+        # Filing dates are stored as text in a sortable format, see _db_rows
+        if start is not None:
+            conditions.append('"Filing Date" >= ?')
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d %H:%M:%S'))
+        if end is not None:
+            conditions.append('"Filing Date" <= ?')
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d %H:%M:%S'))
+
+        select = ', '.join(f'"{column}"' for column in columns)
+        query = f"SELECT {select} FROM transactions"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        with sqlite3.connect(self.output_path) as conn:
+            return pd.read_sql(query, conn, params=params)
 
-            if not df.empty:
-                # Standardize data types
-                df['Qty'] = pd.to_numeric(df['Qty'], errors='coerce').astype('Int64')
-                df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-                df['Value'] = pd.to_numeric(df['Value'], errors='coerce')
-                df['Filing Date'] = pd.to_datetime(df['Filing Date'], errors='coerce')
-                df['Trade Date'] = pd.to_datetime(df['Trade Date'], errors='coerce').dt.date
+    def _read_csv_filtered(self, columns: List[str], tickers: Optional[Iterable[str]], start: Optional[dt.datetime],
+                           end: Optional[dt.datetime], trade_types: Optional[Iterable[str]]) -> pd.DataFrame:
+        """Read the needed columns chunk by chunk, keeping matching records"""
+        needed = set(columns) | set(FILTER_COLUMNS)
+        chunks = pd.read_csv(
+            self.output_path, sep=CSV_SEP, usecols=lambda column: column in needed, dtype=READ_DTYPES,
+            chunksize=LOAD_CHUNK_ROWS
+        )
+        parts = [self._filter_records(chunk, tickers, start, end, trade_types) for chunk in chunks]
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(parts, ignore_index=True)
 
-            return df
+    @staticmethod
+    def _filter_records(df: pd.DataFrame, tickers: Optional[Iterable[str]], start: Optional[dt.datetime],
+                        end: Optional[dt.datetime], trade_types: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Keep records of the given tickers and trade types filed between start and end"""
+        if tickers is not None:
+            df = df[df['Ticker'].isin(list(tickers))]
+        if trade_types is not None:
+            df = df[df['Trade Type'].isin(list(trade_types))]
+        if start is not None or end is not None:
+            filed = pd.to_datetime(df['Filing Date'], errors='coerce', format='ISO8601')
+            keep = pd.Series(True, index=df.index)
+            if start is not None:
+                keep &= filed >= pd.Timestamp(start)
+            if end is not None:
+                keep &= filed <= pd.Timestamp(end)
+            df = df[keep]
+        return df.reset_index(drop=True)
+
+    def load_existing_accessions(self) -> Set[str]:
+        """Load accession numbers of filings already stored in the output"""
+        if not self.output_path.exists():
+            return set()
+
+        suffix = self.output_path.suffix.lower()
+
+        try:
+            if suffix == '.parquet':
+                fc = ParquetStore(self.output_path).read(columns=['FC'])['FC']
+            elif suffix == '.db':
+                with sqlite3.connect(self.output_path) as conn:
+                    fc = pd.read_sql("SELECT DISTINCT FC FROM transactions", conn)['FC']
+            elif suffix == '.csv':
+                fc = pd.read_csv(self.output_path, sep=CSV_SEP, usecols=['FC'], dtype=str)['FC']
+            elif suffix == '.xlsx':
+                fc = pd.read_excel(self.output_path, usecols=['FC'], dtype=str)['FC']
+            else:
+                raise ValueError(f"Unsupported format: {self.output_path.suffix}")
+
+            return set(fc.dropna())
 
         except Exception as e:
-            logger.error(f"Critical error loading {self.output_path}: {str(e)}")
+            logger.error(f"Critical error loading accession numbers from {self.output_path}: {str(e)}")
             raise
 
+    @staticmethod
+    def _ensure_db_schema(conn: sqlite3.Connection):
+        """Create the typed transactions table and its key and ticker indexes
+
+        The key index isn't unique, so appends keep every record and stores written by
+        earlier versions are indexed as they are.
+        """
+        columns = ', '.join(f'"{column}" {DB_TYPES[column]}' for column in COLUMNS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS transactions ({columns})")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS transactions_key ON transactions ({DB_KEY})")
+        conn.execute(DB_TICKER_INDEX)
+
+    @staticmethod
+    def _db_rows(df: pd.DataFrame) -> List[tuple]:
+        """Convert records to SQLite values, in the format pandas uses for to_sql"""
+        df = df.reindex(columns=COLUMNS)
+        columns = {
+            'Filing Date': pd.to_datetime(df['Filing Date'], errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'Trade Date': pd.to_datetime(df['Trade Date'], errors='coerce').dt.strftime('%Y-%m-%d'),
+            'Price': pd.to_numeric(df['Price'], errors='coerce').astype('float64'),
+            'Qty': pd.to_numeric(df['Qty'], errors='coerce').astype('Int64'),
+            'Value': pd.to_numeric(df['Value'], errors='coerce').astype('float64'),
+        }
+        values = []
+        for column in COLUMNS:
+            series = columns.get(column, df[column]).astype(object)
+            values.append(series.where(series.notna(), None).tolist())
+        return list(zip(*values))
+
+    @staticmethod
+    def _insert_db(path: Path, df: pd.DataFrame, save_mode: str) -> int:
+        """Insert records in one transaction, return number inserted
+
+        Merges insert only records whose key isn't stored yet, looked up in the key index,
+        appends insert all of them and rewrites replace the table first.
+        """
+        columns = ', '.join(f'"{column}"' for column in COLUMNS)
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        rows = BaseScraper._db_rows(df)
+        with sqlite3.connect(path) as conn:
+            if save_mode == 'rewrite':
+                conn.execute("DROP TABLE IF EXISTS transactions")
+            BaseScraper._ensure_db_schema(conn)
+            before = conn.total_changes
+            if save_mode == 'merge':
+                conn.executemany(
+                    f"INSERT INTO transactions ({columns}) SELECT {placeholders} "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM transactions WHERE {DB_KEY_MATCH})",
+                    [row + tuple('' if row[i] is None else row[i] for i in DB_KEY_POSITIONS) for row in rows]
+                )
+            else:
+                conn.executemany(f"INSERT INTO transactions ({columns}) VALUES ({placeholders})", rows)
+            return conn.total_changes - before
+
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean duplicates from final dataframe"""
-        return df.drop_duplicates(subset=[
-            'Filing Date', 'Trade Date', 'Ticker', 'Insider Name',
-            'Trade Type', 'Price', 'Qty', 'Value'
-        ]).reset_index(drop=True)
+        return df.drop_duplicates(subset=KEY_COLUMNS).reset_index(drop=True)
+
+    def _close_journal(self):
+        """Remove the progress journal once its rows are saved, keeping it when some units failed
+
+        A kept journal lets --resume retry only the failed units. Its staged rows are saved
+        by then, except in rewrite mode, where the resumed run rewrites them once more.
+        """
+        if self.journal:
+            failed = self.journal.failed
+            if failed:
+                if self.save_mode != 'rewrite':
+                    self.journal.drop_staged()
+                logger.warning(f"{len(failed)} units failed, run again with --resume to retry them: "
+                               f"{', '.join(sorted(failed))}")
+            self.journal.close(remove=not failed)
+            self.journal = None
+
+    def _merge_file(self, df: pd.DataFrame):
+        """Append records not stored yet to an existing CSV or Excel output"""
+        index = FingerprintIndex(self.output_path).load()
+        df, hashes = index.unseen(df)
+
+        if not df.empty:
+            if self.output_path.suffix == '.csv':
+                # Appended rows must follow the column order of the stored header
+                header = pd.read_csv(self.output_path, sep=CSV_SEP, nrows=0).columns
+                df.reindex(columns=header).to_csv(self.output_path, mode='a', header=False, index=False, sep=CSV_SEP)
+            elif self.output_path.suffix == '.xlsx':
+                with pd.ExcelWriter(self.output_path, engine='openpyxl', mode='a', if_sheet_exists='overlay') as writer:
+                    sheet_name, sheet = next(iter(writer.sheets.items()))
+                    header = [cell.value for cell in sheet[1]]
+                    df.reindex(columns=header).to_excel(
+                        writer, sheet_name=sheet_name, startrow=sheet.max_row, header=False, index=False
+                    )
+            else:
+                raise ValueError(f"Unsupported file format: {self.output_path.suffix}")
+            index.add(hashes)
+
+        logger.info(f"Merged {len(df)} new records to {self.output_path}")
 
     def save_results(self, df: pd.DataFrame):
         """Save results to configured output format"""
         try:
             self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Merges look keys up in the store's index, so new rows are inserted without reading the table
+            if self.output_path.suffix == '.db':
+                inserted = self._insert_db(self.output_path, df, self.save_mode)
+                logger.info(f"Inserted {inserted} of {len(df)} records into {self.output_path}")
+                self._close_journal()
+                return
+
+            # Parquet merges rewrite only the ticker and year partitions the new records fall into
+            if self.output_path.suffix == '.parquet':
+                store = ParquetStore(self.output_path)
+                if self.save_mode == 'merge':
+                    existing_df = store.read_partitions(df)
+                    if not existing_df.empty:
+                        df = pd.concat([existing_df, df], ignore_index=True)
+                    df = self._clean_data(df)
+                store.write(df, 'partitions' if self.save_mode == 'merge' else self.save_mode)
+
+                verb = {'rewrite': 'Rewrote', 'append': 'Appended', 'merge': 'Merged'}[self.save_mode]
+                logger.info(f"{verb} {len(df)} records to {self.output_path}")
+                self._close_journal()
+                return
+
+            # CSV and Excel merges append only records missing from the fingerprint index
+            if self.save_mode == 'merge' and self.output_path.exists():
+                self._merge_file(df)
+                self._close_journal()
+                return
+
             # Prepare
             mode = 'w'
-            mode_db = 'replace'
             if self.save_mode == 'append':
                 mode = 'a'
-                mode_db = 'append'
 
             if self.save_mode == 'merge':
-                try:
-                    existing_df = self.load_existing_data()
-                except Exception as e:
-                    logger.warning(f"Couldn't load existing data: {str(e)}")
-                    existing_df = pd.DataFrame(columns=COLUMNS)
-
-                df = pd.concat([existing_df, df], ignore_index=True)
                 df = self._clean_data(df)
 
             # Save
@@ -97,14 +375,15 @@ class BaseScraper:
             elif self.output_path.suffix == '.xlsx':
                 with pd.ExcelWriter(self.output_path, engine='openpyxl', mode=mode) as writer:
                     df.to_excel(writer, index=False)
-            elif self.output_path.suffix == '.db':
-                with sqlite3.connect(self.output_path) as conn:
-                    df.to_sql('transactions', conn, if_exists=mode_db, index=False)
             else:
                 raise ValueError(f"Unsupported file format: {self.output_path.suffix}")
 
+            if self.save_mode != 'append':  # The file holds exactly these records, so later merges needn't rebuild the index
+                FingerprintIndex(self.output_path).add(fingerprints(df))
+
             verb = {'rewrite': 'Rewrote', 'append': 'Appended', 'merge': 'Merged'}[self.save_mode]
             logger.info(f"{verb} file with {len(df)} records to {self.output_path}")
+            self._close_journal()
 
         except Exception as e:
             logger.error(f"Failed to save results: {str(e)}")
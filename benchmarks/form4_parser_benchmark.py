@@ -0,0 +1,173 @@
+"""Benchmark the streaming Form 4 parser against the previous BeautifulSoup parser
+
+Usage: python benchmarks/form4_parser_benchmark.py <folder with .txt submissions> [-n REPEATS]
+
+File names are used as accession numbers. Every filing is parsed by both parsers,
+the output records are checked for equality and the parse times are reported.
+
+Known difference: BeautifulSoup parses the whole SGML wrapper as XML and loses
+escaped characters, e.g. "CEO &amp; President" becomes "CEO  President". The
+streaming parser keeps them, so such filings are reported as mismatches.
+"""
+import argparse
+import datetime as dt
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from arg_parser import get_sec_parser
+from SEC_insider_scraper import SECScraper
+
+logger = logging.getLogger(__name__)
+
+
+class SoupSECScraper(SECScraper):
+    """SEC scraper with the whole-document BeautifulSoup parser it used before form4_parser"""
+
+    def _parse_filing(self, text: str, accession_number: str) -> List[Dict]:
+        """Parse full text submission of a Form 4 filing"""
+        try:
+            soup = BeautifulSoup(text, 'xml')
+        except Exception as e:
+            logger.warning(f"Failed to parse filing {accession_number}: {str(e)}")
+            return []
+
+        # Extract common filing information
+        try:
+            filing_data = {
+                'X': 'D' if soup.find('derivativeTable') else '',
+                'Filing Date': dt.datetime.strptime(
+                    re.search(r"<ACCEPTANCE-DATETIME>(\d+)", text).group(1),
+                    "%Y%m%d%H%M%S"
+                ),
+                'Ticker': soup.find('issuerTradingSymbol').text,
+                'Insider Name': self._normalize_name(soup.find('rptOwnerName').text),
+                'Title': self._extract_title(soup),
+                'FC': accession_number
+            }
+        except AttributeError as e:
+            logger.warning(f"Missing required filing data in {accession_number}: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error parsing {accession_number}: {str(e)}")
+            return []
+
+        # Process non-derivative transactions
+        transactions = []
+        for transaction in soup.find_all('nonDerivativeTransaction'):
+            try:
+                transactions.append(self._parse_transaction(transaction, filing_data))
+            except Exception as e:
+                logger.warning(f"Failed to parse non-derivative transaction: {str(e)}")
+
+        # Process derivative transactions
+        for transaction in soup.find_all('derivativeTransaction'):
+            try:
+                transactions.append(self._parse_transaction(transaction, filing_data))
+            except Exception as e:
+                logger.warning(f"Failed to parse derivative transaction: {str(e)}")
+
+        if not transactions:
+            return []
+
+        return self._combine_transactions(transactions)
+
+    def _extract_title(self, soup: BeautifulSoup) -> str:
+        """Extract and format insider title"""
+        relationship = soup.find('reportingOwnerRelationship')
+        title_parts = []
+
+        if relationship.find('isOfficer', string=lambda x: x in ['true', '1']):
+            title = relationship.find('officerTitle')
+            title_text = title.string if title else 'See Remarks'
+            if 'See Remarks' in title_text and soup.find('remarks'):
+                title_text = soup.find('remarks').string
+            title_parts.append(title_text)
+
+        if relationship.find('isDirector', string=lambda x: x in ['true', '1']):
+            title_parts.append('Director')
+
+        if relationship.find('isTenPercentOwner', string=lambda x: x in ['true', '1']):
+            title_parts.append('10% Owner')
+
+        return ', '.join(title_parts) if title_parts else 'No Title'
+
+    def _parse_transaction(self, transaction: BeautifulSoup, filing_data: Dict) -> Dict:
+        """Parse individual transaction data"""
+        try:
+            price_elem = transaction.find('transactionPricePerShare')
+            price = float(price_elem.value.text) if price_elem else 0.0
+        except (AttributeError, ValueError):
+            price = 0.0
+
+        try:
+            qty_elem = transaction.find('transactionShares')
+            qty = int(qty_elem.value.text) if qty_elem else 0
+        except (AttributeError, ValueError):
+            qty = 0
+
+        try:
+            code = transaction.find('transactionAcquiredDisposedCode').value.text
+        except AttributeError:
+            code = ''
+
+        return {
+            **filing_data,
+            'Trade Date': pd.to_datetime(transaction.find('transactionDate').value.text).date(),
+            'Trade Type': self._trade_type(transaction.find('transactionCode').text),
+            'Price': price,
+            'Qty': qty * (-1 if code == 'D' else 1),
+            'A_D': code
+        }
+
+
+def _time_parser(scraper: SECScraper, filings: Dict[str, str], repeats: int) -> float:
+    """Best total time of parsing all filings"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for accession_number, text in filings.items():
+            scraper._parse_filing(text, accession_number)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Form 4 parser benchmark')
+    parser.add_argument('folder', type=str, help='Folder with full text submissions (.txt)')
+    parser.add_argument('-n', type=int, default=3, help='Number of repeats')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # Skipped transactions and filings are expected in real samples
+    filings = {path.stem: path.read_text(encoding='utf-8', errors='replace')
+               for path in sorted(Path(args.folder).glob('*.txt'))}
+    if not filings:
+        sys.exit(f"No .txt filings found in {args.folder}")
+
+    scraper_args = get_sec_parser().parse_args(['--no-cache'])
+    streaming, soup = SECScraper(scraper_args), SoupSECScraper(scraper_args)
+
+    mismatches = [acc for acc, text in filings.items()
+                  if (streaming._parse_filing(text, acc) or []) != soup._parse_filing(text, acc)]
+
+    soup_time = _time_parser(soup, filings, args.n)
+    streaming_time = _time_parser(streaming, filings, args.n)
+
+    print(f"Filings:      {len(filings)}")
+    print(f"Mismatches:   {len(mismatches)}" + (f" ({', '.join(mismatches[:10])})" if mismatches else ''))
+    print(f"BeautifulSoup: {soup_time:.3f}s ({1000 * soup_time / len(filings):.2f} ms/filing)")
+    print(f"Streaming:     {streaming_time:.3f}s ({1000 * streaming_time / len(filings):.2f} ms/filing)")
+    print(f"Speedup:       {soup_time / streaming_time:.1f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the lxml OpenInsider table extractor against the previous BeautifulSoup parsing
+
+Usage: python benchmarks/openinsider_parser_benchmark.py <folder with saved .html screener pages> [-n REPEATS]
+
+File names are used as tickers. Every page is parsed both ways, the cleaned frames
+are checked for equality and the parse times are reported.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base_scraper import COLUMNS
+from openinsider_scraper import OpenInsiderScraper, columns_op
+
+
+def _soup_parse_page(ticker: str, text: str) -> pd.DataFrame:
+    """Previous parsing: whole page with html.parser, cell texts collected row by row"""
+    HTML = BeautifulSoup(text, "html.parser")
+
+    if len(HTML.find_all("tbody")) <= 1:
+        return pd.DataFrame(columns=COLUMNS)
+
+    table = HTML.find_all("tbody")[1]
+
+    rows = []
+    for row in table.find_all('tr'):
+        cols = row.find_all('td')
+        cols = [ele.text.strip() for ele in cols]
+        rows.append(cols)
+
+    columns = dict(zip(columns_op, map(list, zip(*rows)))) if rows else {name: [] for name in columns_op}
+    return OpenInsiderScraper._clean_rows(columns)
+
+
+def _time(func: Callable, pages: Dict[str, str], repeats: int) -> float:
+    """Best total parse time over all pages"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for ticker, text in pages.items():
+            func(ticker, text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenInsider page parser benchmark')
+    parser.add_argument('folder', type=str, help='Folder with saved screener pages (.html)')
+    parser.add_argument('-n', type=int, default=3, help='Repeats, the best run is reported')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    pages = {path.stem: path.read_text(encoding='utf-8') for path in sorted(Path(args.folder).glob('*.html'))}
+    if not pages:
+        sys.exit(f"No .html pages found in {args.folder}")
+
+    rows = 0
+    mismatches = []
+    for ticker, text in pages.items():
+        old = _soup_parse_page(ticker, text)
+        new = OpenInsiderScraper._parse_page(ticker, text)
+        rows += len(new)
+        if not old.equals(new):
+            mismatches.append(ticker)
+
+    print(f"Pages: {len(pages)}, rows: {rows}, mismatches: {len(mismatches)}")
+    for ticker in mismatches:
+        print(f"  mismatch: {ticker}")
+
+    old_time = _time(_soup_parse_page, pages, args.n)
+    new_time = _time(OpenInsiderScraper._parse_page, pages, args.n)
+    print(f"BeautifulSoup: {old_time:8.3f}s  ({old_time / len(pages) * 1000:.1f} ms/page)")
+    print(f"lxml:          {new_time:8.3f}s  ({new_time / len(pages) * 1000:.1f} ms/page)")
+    print(f"Speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark RecordBuffer against growing a DataFrame with pd.concat per filing
+
+Usage: python benchmarks/record_buffer_benchmark.py [-n ROWS] [-b ROWS_PER_FILING]
+
+Synthetic records shaped like combined Form 4 transactions are accumulated the way
+the scrapers used to (one pd.concat per filing) and with RecordBuffer. Wall time and
+peak traced memory of both are reported. At the default 100k rows the pd.concat
+path takes several minutes, as its cost grows quadratically.
+"""
+import argparse
+import datetime as dt
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base_scraper import RecordBuffer, COLUMNS
+
+
+def _make_filings(n_rows: int, rows_per_filing: int) -> List[List[Dict]]:
+    """Synthetic combined records grouped by filing"""
+    filings = []
+    for start in range(0, n_rows, rows_per_filing):
+        filing_date = dt.datetime(2024, 1, 1) + dt.timedelta(hours=start)
+        filings.append([{
+            'X': 'D' if i % 3 else '',
+            'Filing Date': filing_date,
+            'Trade Date': filing_date.date() - dt.timedelta(days=2),
+            'Ticker': f"T{start % 500}",
+            'Insider Name': f"Insider {start % 2000}",
+            'Title': 'Director',
+            'Trade Type': 'S - Sale' if i % 2 else 'P - Purchase',
+            'Price': 10.0 + i,
+            'Qty': 100 * (i + 1),
+            'Value': 1000 * (i + 1),
+            'FC': f"0000000000-24-{start:06d}"
+        } for i in range(min(rows_per_filing, n_rows - start))])
+    return filings
+
+
+def _concat_per_filing(filings: List[List[Dict]]) -> pd.DataFrame:
+    """Previous accumulation: build a frame per filing and concatenate it to the result"""
+    df = pd.DataFrame(columns=COLUMNS)
+    for records in filings:
+        df = pd.concat([df, pd.DataFrame(records)])
+    return df
+
+
+def _record_buffer(filings: List[List[Dict]]) -> pd.DataFrame:
+    """Current accumulation through RecordBuffer"""
+    records = RecordBuffer()
+    for filing in filings:
+        records.extend(filing)
+    return records.to_frame()
+
+
+def _measure(func: Callable, filings: List[List[Dict]]):
+    """Wall time and peak traced memory of one run"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = func(filings)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record accumulation benchmark')
+    parser.add_argument('-n', type=int, default=100_000, help='Number of rows')
+    parser.add_argument('-b', type=int, default=3, help='Rows per filing')
+    args = parser.parse_args()
+
+    filings = _make_filings(args.n, args.b)
+    print(f"Rows: {args.n} in {len(filings)} filings")
+
+    results = {}
+    for name, func in (('pd.concat per filing', _concat_per_filing), ('RecordBuffer', _record_buffer)):
+        df, elapsed, peak = _measure(func, filings)
+        results[name] = (elapsed, peak)
+        print(f"{name:22} {elapsed:8.2f}s  peak {peak / 1024 ** 2:8.1f} MiB  rows {len(df)}")
+
+    (old_time, old_peak), (new_time, new_peak) = results.values()
+    print(f"Speedup: {old_time / new_time:.1f}x, peak memory ratio: {old_peak / new_peak:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark memory use and deduplication time of transaction frames before and after the schema
+
+Usage: python benchmarks/schema_memory_benchmark.py [-n ROWS] [-f OUTPUT_FILE] [-r REPEATS]
+
+Records are synthetic, shaped like a multi-ticker history, or loaded from an existing
+output file. They are typed the way frames used to be (object strings and Python date
+objects for trade dates) and with schema.apply_schema. The deep memory use of both
+frames and the best time of _clean_data's drop_duplicates are reported.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base_scraper import BaseScraper
+from schema import COLUMNS, KEY_COLUMNS, apply_schema
+
+
+def _make_records(n_rows: int) -> pd.DataFrame:
+    """Synthetic history of a few thousand tickers and insiders"""
+    rng = np.random.default_rng(0)
+    filing_dates = pd.Timestamp(2010, 1, 1) + pd.to_timedelta(rng.integers(0, 15 * 365 * 86400, n_rows), unit='s')
+    insiders = rng.integers(0, 20_000, n_rows)
+    return pd.DataFrame({
+        'X': rng.choice(['', 'D', 'DM', 'M'], n_rows),
+        'Filing Date': filing_dates,
+        'Trade Date': filing_dates.normalize() - pd.to_timedelta(rng.integers(0, 5, n_rows), unit='D'),
+        'Ticker': [f"T{ticker}" for ticker in insiders % 3000],
+        'Insider Name': [f"Insider {insider}" for insider in insiders],
+        'Title': rng.choice(['Director', 'CEO', 'CFO', '10%', 'COO, Director', 'Pres'], n_rows),
+        'Trade Type': rng.choice(['P - Purchase', 'S - Sale', 'S - Sale+OE', 'M - OptEx'], n_rows),
+        'Price': rng.integers(100, 50_000, n_rows) / 100,
+        'Qty': rng.integers(1, 100_000, n_rows),
+        'Value': rng.integers(100, 10_000_000, n_rows).astype('float64'),
+        'FC': [f"0000000000-24-{i // 3:06d}" for i in range(n_rows)],
+    })
+
+
+def _legacy_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Column types frames had before the schema"""
+    df = df.reindex(columns=COLUMNS)
+    for column in ('X', 'Ticker', 'Insider Name', 'Title', 'Trade Type', 'FC'):
+        df[column] = df[column].astype(object)
+    df['Qty'] = pd.to_numeric(df['Qty'], errors='coerce').astype('Int64')
+    df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
+    df['Value'] = pd.to_numeric(df['Value'], errors='coerce')
+    df['Filing Date'] = pd.to_datetime(df['Filing Date'], errors='coerce', format='ISO8601')
+    df['Trade Date'] = pd.to_datetime(df['Trade Date'], errors='coerce', format='ISO8601').dt.date
+    return df
+
+
+def _dedup_time(df: pd.DataFrame, repeats: int) -> float:
+    """Best drop_duplicates time over the key columns"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df.drop_duplicates(subset=KEY_COLUMNS)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transaction frame schema benchmark')
+    parser.add_argument('-n', type=int, default=1_000_000, help='Number of synthetic rows')
+    parser.add_argument('-f', type=str, help='Existing output file to load instead of synthetic rows')
+    parser.add_argument('-r', type=int, default=3, help='Repeats, the best run is reported')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    if args.f:
+        records = BaseScraper(Path(args.f), 'merge').load_existing_data()
+    else:
+        records = _make_records(args.n)
+    print(f"Rows: {len(records)}")
+
+    results = {}
+    for name, df in (('object columns', _legacy_types(records)), ('schema', apply_schema(records))):
+        memory = df.memory_usage(deep=True).sum()
+        elapsed = _dedup_time(df, args.r)
+        results[name] = (memory, elapsed)
+        print(f"{name:15} memory {memory / 1024 ** 2:8.1f} MiB  drop_duplicates {elapsed:7.3f}s")
+
+    (old_memory, old_time), (new_memory, new_time) = results.values()
+    print(f"Memory ratio: {old_memory / new_memory:.1f}x, drop_duplicates speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
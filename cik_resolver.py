@@ -0,0 +1,84 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CIKResolver:
+    """Ticker to CIK index persisted on disk with a time-to-live"""
+
+    def __init__(self, path: Path, ttl_seconds: float, fetch: Callable[[], Dict], offline: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.fetch = fetch
+        self.offline = offline
+        self._ticker_to_cik = None
+        self._cik_to_ticker = None
+
+    def _is_fresh(self) -> bool:
+        return self.path.exists() and time.time() - self.path.stat().st_mtime < self.ttl_seconds
+
+    def _load(self):
+        """Load index from disk, refreshing it from the SEC when it is missing or expired"""
+        ticker_to_cik = None
+        if self._is_fresh() or (self.offline and self.path.exists()):
+            ticker_to_cik = self._read()
+
+        if ticker_to_cik is None:
+            try:
+                ticker_to_cik = self._build(self.fetch())
+                self._write(ticker_to_cik)
+            except Exception as e:
+                if not self.path.exists():
+                    self._ticker_to_cik, self._cik_to_ticker = {}, {}  # Don't retry for every ticker
+                    raise
+                logger.warning(f"Failed to refresh CIK map, using stored copy: {str(e)}")
+                ticker_to_cik = self._read() or {}
+
+        self._ticker_to_cik = ticker_to_cik
+        self._cik_to_ticker = {}
+        for ticker, cik in ticker_to_cik.items():
+            self._cik_to_ticker.setdefault(cik, ticker)  # First listed ticker is the primary one
+
+    @staticmethod
+    def _build(cik_map: Dict) -> Dict[str, str]:
+        """Index company_tickers.json entries by ticker"""
+        ticker_to_cik = {}
+        for entry in cik_map.values():
+            ticker = str(entry.get('ticker', '')).upper()
+            if ticker:
+                ticker_to_cik.setdefault(ticker, str(entry['cik_str']).zfill(10))
+        return ticker_to_cik
+
+    def _read(self) -> Optional[Dict[str, str]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Couldn't read CIK map {self.path}: {str(e)}")
+            return None
+
+    def _write(self, ticker_to_cik: Dict[str, str]):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(ticker_to_cik, f)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Couldn't store CIK map {self.path}: {str(e)}")
+
+    def to_cik(self, ticker: str) -> Optional[str]:
+        """Return zero padded CIK of a ticker or None if it is unknown"""
+        if self._ticker_to_cik is None:
+            self._load()
+        return self._ticker_to_cik.get(ticker.strip().upper())
+
+    def to_ticker(self, cik: str) -> Optional[str]:
+        """Return primary ticker of a CIK or None if it is unknown"""
+        if self._cik_to_ticker is None:
+            self._load()
+        return self._cik_to_ticker.get(str(cik).strip().zfill(10))
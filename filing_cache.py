@@ -0,0 +1,90 @@
+import gzip
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FilingCache:
+    """Compressed on-disk cache of SEC documents with a size cap and LRU eviction"""
+
+    SUFFIX = '.txt.gz'
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Least recently used entries first, keyed by cache key with file size as value
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild LRU order from file modification times"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached document or None if it is not cached"""
+        if key not in self._entries:
+            return None
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)  # Persist recency for the next run
+        except (OSError, EOFError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {str(e)}")
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return text
+
+    def put(self, key: str, text: str):
+        """Store document and evict least recently used entries above the size cap"""
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)  # Atomic, so readers never see partial files
+        except OSError as e:
+            logger.warning(f"Failed to cache {key}: {str(e)}")
+            return
+
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key)
+        size = path.stat().st_size
+        self._entries[key] = size
+        self._total_bytes += size
+
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its cap"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+
+    def _remove(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
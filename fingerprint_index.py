@@ -0,0 +1,113 @@
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Tuple
+
+from schema import KEY_COLUMNS
+from settings import CSV_SEP
+
+logger = logging.getLogger(__name__)
+
+REBUILD_CHUNK_ROWS = 100_000  # CSV rows read at once when rebuilding the index
+TEXT_KEY_COLUMNS = ['Ticker', 'Insider Name', 'Trade Type']
+NUMERIC_KEY_COLUMNS = ['Price', 'Qty', 'Value']
+
+
+def fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hashes of the trade key columns, one per row
+
+    Values are normalized first, so typed records and the text read back from a
+    file hash the same.
+    """
+    df = df.reindex(columns=KEY_COLUMNS)
+    filing_dates = pd.to_datetime(df['Filing Date'], errors='coerce', format='ISO8601')
+    trade_dates = pd.to_datetime(df['Trade Date'], errors='coerce', format='ISO8601')
+    key = {
+        'Filing Date': filing_dates.dt.strftime('%Y-%m-%d %H:%M:%S').fillna(''),
+        'Trade Date': trade_dates.dt.strftime('%Y-%m-%d').fillna(''),
+    }
+    for column in TEXT_KEY_COLUMNS:
+        key[column] = df[column].astype(object).where(df[column].notna(), '').astype(str)
+    for column in NUMERIC_KEY_COLUMNS:
+        key[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+    key = pd.DataFrame(key, columns=KEY_COLUMNS)
+    return pd.util.hash_pandas_object(key, index=False).to_numpy(dtype=np.uint64)
+
+
+class FingerprintIndex:
+    """Sidecar file with the sorted key fingerprints of every trade in a CSV or Excel output
+
+    Merges look new records up in the index and append only unseen ones, instead of
+    reading and rewriting the whole file. The index stores the size and modification
+    time of the output it describes and is rebuilt from the output when they differ,
+    e.g. after an append, a rewrite or a manual edit.
+    """
+
+    def __init__(self, output_path: Path):
+        self.output_path = output_path
+        self.path = self.path_for(output_path)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        """Index location next to the output file"""
+        return output_path.with_name(output_path.name + '.fingerprints.npz')
+
+    def _stamp(self) -> Tuple[int, int]:
+        """Size and modification time of the output"""
+        stat = self.output_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def load(self) -> 'FingerprintIndex':
+        """Load the index, rebuilding it when it's missing or doesn't match the output"""
+        if not self.output_path.exists():
+            self.hashes = np.empty(0, dtype=np.uint64)
+            return self
+
+        if self.path.exists():
+            try:
+                with np.load(self.path) as data:
+                    if tuple(data['stamp']) == self._stamp():
+                        self.hashes = data['hashes']
+                        return self
+            except Exception as e:
+                logger.warning(f"Couldn't read fingerprint index {self.path}: {str(e)}")
+
+        logger.info(f"Rebuilding fingerprint index of {self.output_path}")
+        self.hashes = np.unique(self._read_output())
+        self.save()
+        return self
+
+    def _read_output(self) -> np.ndarray:
+        """Fingerprints of every row stored in the output"""
+        if self.output_path.suffix.lower() == '.xlsx':
+            df = pd.read_excel(self.output_path, dtype=str, keep_default_na=False)
+            return fingerprints(df)
+
+        chunks = pd.read_csv(
+            self.output_path, sep=CSV_SEP, dtype=str, keep_default_na=False, chunksize=REBUILD_CHUNK_ROWS
+        )
+        parts = [fingerprints(chunk) for chunk in chunks]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+
+    def unseen(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Records whose key isn't in the index yet, keeping the first of repeated ones, and their fingerprints"""
+        hashes = fingerprints(df)
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        hashes = hashes[first]
+
+        positions = np.searchsorted(self.hashes, hashes).clip(max=max(len(self.hashes) - 1, 0))
+        known = self.hashes[positions] == hashes if len(self.hashes) else np.zeros(len(hashes), dtype=bool)
+        return df.iloc[first[~known]].reset_index(drop=True), hashes[~known]
+
+    def add(self, hashes: np.ndarray):
+        """Add fingerprints of records just written to the output and save the index"""
+        self.hashes = np.union1d(self.hashes, hashes)
+        self.save()
+
+    def save(self):
+        """Store the index together with the current state of the output"""
+        with open(self.path, 'wb') as f:
+            np.savez(f, hashes=self.hashes, stamp=np.array(self._stamp(), dtype=np.int64))
@@ -0,0 +1,125 @@
+import datetime as dt
+import io
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+ACCEPTANCE_DATETIME = re.compile(r"<ACCEPTANCE-DATETIME>(\d+)")
+DOCUMENT_START = '<ownershipDocument'
+DOCUMENT_END = '</ownershipDocument>'
+
+FIRST_TEXT_TAGS = ('issuerTradingSymbol', 'rptOwnerName')
+TRANSACTION_TAGS = ('nonDerivativeTransaction', 'derivativeTransaction')
+RELATIONSHIP_FLAGS = ('isOfficer', 'isDirector', 'isTenPercentOwner')
+TRUE_VALUES = ('true', '1')
+EVENT_TAGS = FIRST_TEXT_TAGS + TRANSACTION_TAGS + ('reportingOwnerRelationship', 'remarks', 'derivativeTable')
+
+
+def _text(element: etree._Element) -> str:
+    """Text of an element and all its descendants"""
+    return ''.join(element.itertext())
+
+
+def _string(element: etree._Element) -> Optional[str]:
+    """Text of a leaf element, None if it is empty or has children"""
+    return element.text if len(element) == 0 else None
+
+
+def _value_text(element: etree._Element, tag: str) -> Optional[str]:
+    """Text of the first <value> inside the first descendant with the given tag"""
+    node = element.find('.//' + tag)
+    if node is None:
+        return None
+    value = node.find('.//value')
+    return _text(value) if value is not None else None
+
+
+def _parse_relationship(element: etree._Element) -> Dict:
+    """Extract title relevant fields of a reportingOwnerRelationship element"""
+    relationship = {
+        flag: any(_string(node) in TRUE_VALUES for node in element.iter(flag))
+        for flag in RELATIONSHIP_FLAGS
+    }
+    title = element.find('.//officerTitle')
+    # An empty <officerTitle/> is '' like the text of other elements, None only means no title element
+    relationship['officerTitle'] = (_string(title) or '') if title is not None else None
+    return relationship
+
+
+def _parse_transaction(element: etree._Element) -> Dict:
+    """Extract raw fields of a (non-)derivative transaction element, None when missing"""
+    code = element.find('.//transactionCode')
+    return {
+        'date': _value_text(element, 'transactionDate'),
+        'code': _text(code) if code is not None else None,
+        'shares': _value_text(element, 'transactionShares'),
+        'price': _value_text(element, 'transactionPricePerShare'),
+        'acquired_disposed': _value_text(element, 'transactionAcquiredDisposedCode'),
+    }
+
+
+class Form4Document:
+    """Form 4 fields extracted in one streaming pass over the ownershipDocument block"""
+
+    def __init__(self, text: str):
+        start = text.find(DOCUMENT_START)
+        end = text.find(DOCUMENT_END, start)
+
+        # Acceptance datetime lives in the SGML header before the XML document
+        match = ACCEPTANCE_DATETIME.search(text, 0, start if start != -1 else len(text))
+        self.acceptance_datetime = match.group(1) if match else None
+
+        self.has_derivative_table = False
+        self.relationship = None
+        self.has_remarks = False
+        self.remarks = None
+        self.transactions = {tag: [] for tag in TRANSACTION_TAGS}
+        self._first_text = {}
+
+        if start != -1 and end != -1:
+            self._parse(text[start:end + len(DOCUMENT_END)])
+
+    def _parse(self, document: str):
+        """Walk the XML document once, keeping only the fields the scraper uses"""
+        events = etree.iterparse(
+            io.BytesIO(document.encode('utf-8')), events=('end',), tag=EVENT_TAGS, recover=True
+        )
+        for _, element in events:
+            tag = element.tag
+            if tag in TRANSACTION_TAGS:
+                self.transactions[tag].append(_parse_transaction(element))
+                element.clear()
+            elif tag in FIRST_TEXT_TAGS:
+                self._first_text.setdefault(tag, _text(element))
+            elif tag == 'reportingOwnerRelationship':
+                if self.relationship is None:
+                    self.relationship = _parse_relationship(element)
+            elif tag == 'remarks':
+                if not self.has_remarks:
+                    self.has_remarks = True
+                    self.remarks = _string(element) or ''
+            elif tag == 'derivativeTable':
+                self.has_derivative_table = True
+
+    def filing_date(self) -> dt.datetime:
+        """Acceptance datetime of the submission"""
+        if self.acceptance_datetime is None:
+            raise AttributeError("ACCEPTANCE-DATETIME not found")
+        return dt.datetime.strptime(self.acceptance_datetime, "%Y%m%d%H%M%S")
+
+    def first_text(self, tag: str) -> str:
+        """Text of the first element with the given tag"""
+        if tag not in self._first_text:
+            raise AttributeError(f"{tag} not found")
+        return self._first_text[tag]
+
+    def get_relationship(self) -> Dict:
+        """Fields of the first reporting owner relationship"""
+        if self.relationship is None:
+            raise AttributeError("reportingOwnerRelationship not found")
+        return self.relationship
+
+    def get_transactions(self, tag: str) -> List[Dict]:
+        """Raw fields of all transactions of the given kind in document order"""
+        return self.transactions[tag]
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Optional
+
+from schema import COLUMNS
+
+
+def format_title(is_officer: bool, officer_title: Optional[str], remarks: Optional[str],
+                 is_director: bool, is_ten_percent_owner: bool) -> str:
+    """Format insider title from reporting owner relationship fields
+
+    A missing officer title (None) is shown as 'See Remarks', which is replaced by the
+    remarks when the filing has any. Empty titles add nothing.
+    """
+    title_parts = []
+
+    if is_officer:
+        title_text = 'See Remarks' if officer_title is None else officer_title
+        if 'See Remarks' in title_text and remarks:
+            title_text = remarks
+        if title_text:
+            title_parts.append(title_text)
+
+    if is_director:
+        title_parts.append('Director')
+
+    if is_ten_percent_owner:
+        title_parts.append('10% Owner')
+
+    return ', '.join(title_parts) if title_parts else 'No Title'
+
+
+class Form4RecordMixin:
+    """Turns raw Form 4 transaction fields into output records
+
+    Shared by the SEC scraper and the bulk data set ingester, so both produce the same
+    rows. Classes using it set comb_adj_dates.
+    """
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normalize insider name formatting"""
+        words = []
+        for word in name.split():
+            if '-' in word:
+                word = '-'.join([p.capitalize() for p in word.split('-')])
+            else:
+                word = word.capitalize()
+
+            if word.lower().startswith('mc') and len(word) > 2:
+                word = word[:2] + word[2].upper() + word[3:].lower()
+
+            words.append(word)
+
+        return ' '.join(words)
+
+    @staticmethod
+    def _custom_round(number: float, precision: int = 0) -> float:
+        """Custom rounding function, rounding away from zero when the rounding part is exactly in the middle"""
+        factor = 10 ** precision
+        scaled = number * factor
+        decimal = scaled - int(scaled)
+
+        if abs(decimal) == 0.5:
+            scaled = int(scaled) + (1 if scaled > 0 else -1)
+        else:
+            scaled = round(scaled)
+
+        return (scaled / factor) if precision != 0 else int(scaled)
+
+    @staticmethod
+    def _custom_round_array(numbers: np.ndarray, precision: int = 0) -> np.ndarray:
+        """Vectorized _custom_round with identical results"""
+        factor = 10 ** precision
+        scaled = numbers * factor
+        truncated = np.trunc(scaled)
+        rounded = np.where(
+            np.abs(scaled - truncated) == 0.5,
+            truncated + np.where(scaled > 0, 1, -1),
+            np.round(scaled)  # Half to even like round(), only reached when not exactly halfway
+        )
+        return rounded / factor if precision != 0 else rounded.astype(np.int64)
+
+    @staticmethod
+    def _sequential_group_sum(group_ids: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+        """Per-group sums added in row order, matching Python's sum bit for bit
+
+        NumPy and pandas use pairwise or compensated summation, which can differ in the
+        last bit and flip halfway rounding. Instead the k-th row of every group is added
+        in step k, so each step is one vectorized operation over distinct groups.
+        """
+        order = np.argsort(group_ids, kind='stable')
+        sorted_ids = group_ids[order]
+        position = np.arange(len(order)) - np.searchsorted(sorted_ids, sorted_ids)
+        by_position = order[np.argsort(position, kind='stable')]
+
+        totals = np.zeros(n_groups)
+        offset = 0
+        for count in np.bincount(position):
+            rows = by_position[offset:offset + count]
+            totals[group_ids[rows]] += values[rows]
+            offset += count
+        return totals
+
+    def _combine_transactions_frame(self, transactions: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized _combine_transactions over parsed transactions of many filings at once"""
+        if transactions.empty:
+            return pd.DataFrame(columns=COLUMNS)
+
+        df = transactions.reset_index(drop=True)
+        keys = ['FC', 'Trade Type', 'A_D']
+        if not self.comb_adj_dates:
+            keys.append('Trade Date')
+
+        # Groups are numbered in order of first appearance, like the dict in _combine_transactions
+        group_ids = df.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+        n_groups = group_ids.max() + 1
+        sizes = np.bincount(group_ids, minlength=n_groups)
+        _, first_rows = np.unique(group_ids, return_index=True)
+        first = df.iloc[first_rows].reset_index(drop=True)
+
+        qty = df['Qty'].to_numpy(dtype=np.int64)
+        total_qty = np.zeros(n_groups, dtype=np.int64)
+        np.add.at(total_qty, group_ids, qty)
+        total_value = self._sequential_group_sum(group_ids, df['Price'].to_numpy(dtype=np.float64) * np.abs(qty), n_groups)
+        avg_price = np.divide(total_value, np.abs(total_qty), out=np.zeros(n_groups), where=total_qty != 0)
+
+        trade_dates = pd.to_datetime(df['Trade Date']).groupby(group_ids).min().to_numpy()
+
+        return pd.DataFrame({
+            'X': first['X'].where(sizes == 1, first['X'] + 'M'),
+            'Filing Date': first['Filing Date'],
+            'Trade Date': trade_dates,
+            'Ticker': first['Ticker'],
+            'Insider Name': first['Insider Name'],
+            'Title': first['Title'],
+            'Trade Type': first['Trade Type'],
+            'Price': self._custom_round_array(avg_price, 2),
+            'Qty': total_qty,
+            'Value': self._custom_round_array(total_value),
+            'FC': first['FC']
+        }, columns=COLUMNS)
+
+    def _combine_transactions(self, transactions: List[Dict]) -> List[Dict]:
+        """Combine transactions in the same filing occurring on adjacent or the same date"""
+        # Grouping
+        grouped = {}
+        for trans in transactions:
+            key = (trans['Trade Type'], trans['A_D'])
+            if not self.comb_adj_dates:
+                key += (trans['Trade Date'],)
+
+            if key not in grouped:
+                grouped[key] = []
+            grouped[key].append(trans)
+
+        # Combining
+        combined = []
+        for key, group in grouped.items():
+            total_qty = sum(t['Qty'] for t in group)
+            total_value = sum(float(t['Price']) * abs(t['Qty']) for t in group)
+            avg_price = total_value / abs(total_qty) if total_qty != 0 else 0
+
+            combined.append({
+                'X': group[0]['X'] + 'M' if len(group) > 1 else group[0]['X'],
+                'Filing Date': group[0]['Filing Date'],
+                'Trade Date': min(t['Trade Date'] for t in group),
+                'Ticker': group[0]['Ticker'],
+                'Insider Name': group[0]['Insider Name'],
+                'Title': group[0]['Title'],
+                'Trade Type': group[0]['Trade Type'],
+                'Price': self._custom_round(avg_price, 2),
+                'Qty': total_qty,
+                'Value': int(self._custom_round(total_value)),
+                'FC': group[0]['FC']
+            })
+
+        return combined
+
+    @classmethod
+    def _parse_transaction(cls, transaction: Dict, filing_data: Dict) -> Dict:
+        """Parse individual transaction data"""
+        if transaction['date'] is None or transaction['code'] is None:
+            raise AttributeError("Missing transaction date or code")
+
+        try:
+            price = float(transaction['price'])
+        except (TypeError, ValueError):
+            price = 0.0
+
+        try:
+            qty = int(transaction['shares'])
+        except (TypeError, ValueError):
+            qty = 0
+
+        code = transaction['acquired_disposed'] or ''
+
+        return {
+            **filing_data,
+            'Trade Date': pd.to_datetime(transaction['date']).date(),
+            'Trade Type': cls._trade_type(transaction['code']),
+            'Price': price,
+            'Qty': qty * (-1 if code == 'D' else 1),
+            'A_D': code
+        }
+
+    @staticmethod
+    def _trade_type(code: str) -> str:
+        """Map transaction codes to openinsider format"""
+        types = {
+            'P': 'Purchase',
+            'S': 'Sale',
+            'A': 'Grant',
+            'D': 'Sale to Iss',
+            'G': 'Gift',
+            'F': 'Tax',
+            'M': 'OptEx',
+            'X': 'OptEx',
+            'C': 'Cnv Deriv',
+            'W': 'Inherited'
+        }
+        return f"{code} - {types.get(code, 'Unknown')}"
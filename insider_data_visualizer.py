@@ -1,7 +1,9 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import logging
+import multiprocessing as mp
+import os
+import numpy as np
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 from pathlib import Path
 from matplotlib.dates import DateFormatter
@@ -9,23 +11,42 @@ import seaborn as sns
 from adjustText import adjust_text
 from datetime import datetime, timedelta
 import argparse
+from contextlib import closing
 
 
 from arg_parser import get_visualizer_parser
 from base_scraper import BaseScraper
-from settings import LINK, CSV_SEP
+from price_cache import PriceCache, csv_folder_source, fetch_yfinance
+from settings import LINK, CSV_SEP, PRICE_CACHE_PATH
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TRADE_TYPES = ["P - Purchase", "S - Sale"]  # Only buys and sells are charted
+CHART_COLUMNS = ["Filing Date", "Trade Date", "Insider Name", "Title", "Trade Type", "Price", "Qty"]
+
 
 class Visualizer:
-    def __init__(self, args: argparse.Namespace):
-        self.ticker = args.ticker
-        self.start_date = self._parse_date(args.sd, default=datetime.now() - timedelta(days=365))
-        self.end_date = self._parse_date(args.ed, default=datetime.now())
+    def __init__(self, args: argparse.Namespace, ticker: Optional[str] = None, df: Optional[pd.DataFrame] = None):
+        """Chart of one ticker, its trades are loaded from the data file unless given"""
+        self.ticker = ticker or args.tickers[0]
+        self.start_date, self.end_date = self._date_range(args)
         self.data_path = Path(args.s) if args.s else LINK
-        self.df = self._load_data()
+        df = self._load_data() if df is None else df
+        self.df = df.sort_values(by=["Filing Date", "Trade Date"], ascending=[True, False])
+        source = csv_folder_source(Path(args.prices)) if args.prices else fetch_yfinance
+        self.prices = PriceCache(PRICE_CACHE_PATH, source, offline=args.offline)
+
+    def close(self):
+        """Close the price cache"""
+        self.prices.close()
+
+    @staticmethod
+    def _date_range(args: argparse.Namespace) -> Tuple[datetime, datetime]:
+        """Charted dates, the last year by default"""
+        start_date = Visualizer._parse_date(args.sd, default=datetime.now() - timedelta(days=365))
+        end_date = Visualizer._parse_date(args.ed, default=datetime.now())
+        return start_date, end_date
 
     @staticmethod
     def _parse_date(date_str: str, default: datetime) -> datetime:
@@ -42,49 +63,60 @@ class Visualizer:
         scraper = BaseScraper(output_path=self.data_path, save_mode="rewrite")
 
         try:
-            df = scraper.load_existing_data()
+            df = scraper.load_existing_data(
+                tickers=[self.ticker], start=self.start_date, end=self.end_date,
+                trade_types=TRADE_TYPES, columns=CHART_COLUMNS
+            )
         except Exception as e:
             logger.error(f"Failed to load data: {str(e)}")
             raise
 
-        # Apply filters
-        df = df[df["Ticker"] == self.ticker]
-        df = df[df["Trade Type"].isin(["P - Purchase", "S - Sale"])]
-        df = df[
-            (df["Filing Date"] >= pd.to_datetime(self.start_date)) &
-            (df["Filing Date"] <= pd.to_datetime(self.end_date))
-            ]
-        return df.sort_values(by=["Filing Date", "Trade Date"], ascending=[True, False])
+        return df
 
     def _generate_labels(self) -> Tuple[List[str], List[datetime]]:
-        """Generate annotation labels"""
-        labels = []
-        labels_dates = []
-        current_date = datetime.min
-
-        for _, row in self.df.iterrows():
-            if row["Filing Date"].date() != current_date.date():
-                current_date = row["Filing Date"]
-                labels.append(f"Date: {current_date}")
-                labels_dates.append(current_date)
-            else:
-                labels[-1] += "\n----------------------\n" + f"Date: {current_date}"
-
-            labels[-1] += (
-                f"\n----------------------\n" 
-                f"TD: {row['Trade Date']}\n"  # Fixed line
-                f"TT: {row['Trade Type']}\n"
-                f"IN: {row['Insider Name']}\n"
-                f"T: {row['Title']}\n"
-                f"P: {row['Price']} Qty: {row['Qty']}"
-            )
+        """Generate annotation labels, one per filing day with an entry per trade"""
+        if self.df.empty:
+            return [], []
+
+        df = self.df
+        filing_days = df["Filing Date"].dt.normalize()
+        first_of_day = filing_days.ne(filing_days.shift()).to_numpy()
+
+        # Every label is headed by the first filing time of its day, repeated before each further trade
+        label_dates = df["Filing Date"].where(first_of_day).ffill()
+        label_date_text = "Date: " + label_dates.dt.strftime("%Y-%m-%d %H:%M:%S")
+        separator = "\n----------------------\n"
+        entries = (
+            (separator + label_date_text).where(~first_of_day, "")
+            + separator
+            + "TD: " + df["Trade Date"].dt.strftime("%Y-%m-%d").fillna("NaT")
+            + "\nTT: " + df["Trade Type"].astype(str).fillna("nan")
+            + "\nIN: " + df["Insider Name"].astype(str).fillna("nan")
+            + "\nT: " + df["Title"].astype(str).fillna("nan")
+            + "\nP: " + df["Price"].astype(str).fillna("nan") + " Qty: " + df["Qty"].astype(str).fillna("<NA>")
+        )
+        # Rows of a day are consecutive, so entries are joined per day by one reduceat over the starts
+        day_entries = np.add.reduceat(entries.to_numpy(dtype=object), np.flatnonzero(first_of_day))
+        labels = label_date_text[first_of_day].to_numpy(dtype=object) + day_entries
+
+        return labels.tolist(), label_dates[first_of_day].tolist()
+
+    @staticmethod
+    def _nearest_prices(stock_data: pd.DataFrame, dates: List[datetime]) -> np.ndarray:
+        """Close prices on the trading days nearest to the dates, earlier days win ties"""
+        days = stock_data["Date"].to_numpy(dtype="datetime64[ns]")
+        close_prices = stock_data["Close"].to_numpy(dtype="float64").ravel()
+        targets = np.asarray(pd.to_datetime(dates), dtype="datetime64[ns]")
 
-        return labels, labels_dates
+        after = np.searchsorted(days, targets).clip(0, len(days) - 1)
+        before = (after - 1).clip(0, len(days) - 1)
+        nearest = np.where(np.abs(targets - days[before]) <= np.abs(days[after] - targets), before, after)
+        return close_prices[nearest]
 
     def _fetch_stock_data(self) -> pd.DataFrame:
-        """Fetch stock data using yfinance"""
+        """Daily prices from the local cache, fetching only dates it doesn't hold yet"""
         try:
-            data = yf.download(self.ticker, start=self.start_date, end=self.end_date, auto_adjust=True)
+            data = self.prices.history(self.ticker, self.start_date.date(), self.end_date.date())
 
             if data.empty:
                 logging.warning(f"No data available for {self.ticker} between {self.start_date} and {self.end_date}.")
@@ -93,14 +125,14 @@ class Visualizer:
             return data
 
         except Exception as e:
-            logging.error(f"Error fetching data for {self.ticker} using yfinance: {e}")
+            logging.error(f"Error loading prices for {self.ticker}: {e}")
 
         return pd.DataFrame()
 
-    def visualize(self):
-        """Main visualization controller"""
+    def visualize(self, output_path: Optional[Path] = None):
+        """Main visualization controller, the chart is saved to output_path if given, otherwise shown"""
         if self.df.empty:
-            logger.warning("No data to visualize")
+            logger.warning(f"No data to visualize for {self.ticker}")
             return
 
         # Fetch stock data
@@ -120,24 +152,19 @@ class Visualizer:
             )
         except Exception as e:
             logger.error(f"Plotting failed: {str(e)}")
+            plt.close()
             return
 
         # Generate annotations
         labels, labels_dates = self._generate_labels()
         if not labels or not labels_dates:
             logger.warning("No insider trades to annotate")
+            plt.close()
             return
 
         texts = []
-        for label, date in zip(labels, labels_dates):
-            # Find nearest index using stock_data_reset's 'Date' column
-            nearest_idx = stock_data_reset['Date'].sub(date).abs().idxmin()
-            close_prices = stock_data_reset['Close'].to_numpy().flatten()  # 1D array
-            if nearest_idx >= len(close_prices):
-                logger.error(f"Index {nearest_idx} out of bounds. Skipping annotation.")
-                continue
-            price = close_prices[nearest_idx].item()  # Ensure scalar
-
+        prices = self._nearest_prices(stock_data_reset, labels_dates)
+        for label, date, price in zip(labels, labels_dates, prices.tolist()):
             color = 'green' if 'P - Purchase' in label else 'red'
             text = plt.annotate(
                 label,
@@ -157,7 +184,50 @@ class Visualizer:
         plt.xticks(rotation=45)
         plt.grid(alpha=0.3)
         plt.tight_layout()
-        plt.show()
+        if output_path:
+            plt.savefig(output_path)
+            plt.close()
+            logger.info(f"Saved {self.ticker} chart to {output_path}")
+        else:
+            plt.show()
+
+
+def _init_worker():
+    """Render without a display in pool worker processes"""
+    plt.switch_backend('Agg')
+
+
+def _render_ticker(task: Tuple[argparse.Namespace, str, pd.DataFrame]) -> str:
+    """Render the chart of one ticker from its slice of the trades"""
+    args, ticker, df = task
+    try:
+        with closing(Visualizer(args, ticker, df)) as visualizer:
+            visualizer.visualize(Path(args.o) / f"{ticker}.{args.format}")
+    except Exception as e:
+        logger.error(f"Failed to render {ticker}: {str(e)}")
+    return ticker
+
+
+def render_batch(args: argparse.Namespace, tickers: List[str]):
+    """Render charts of many tickers to files across a process pool, loading the data file once"""
+    plt.switch_backend('Agg')
+    output_dir = Path(args.o or '.')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    args.o = str(output_dir)
+
+    start_date, end_date = Visualizer._date_range(args)
+    scraper = BaseScraper(output_path=Path(args.s) if args.s else LINK, save_mode="rewrite")
+    df = scraper.load_existing_data(
+        tickers=tickers, start=start_date, end=end_date, trade_types=TRADE_TYPES, columns=CHART_COLUMNS + ["Ticker"]
+    )
+    # Workers only receive the trades of their ticker
+    slices = {ticker: group.drop(columns="Ticker") for ticker, group in df.groupby("Ticker", observed=True)}
+    tasks = [(args, ticker, slices.get(ticker, df.iloc[0:0][CHART_COLUMNS])) for ticker in tickers]
+
+    processes = min(args.processes or os.cpu_count() or 1, len(tasks))
+    with mp.Pool(processes, initializer=_init_worker) as pool:
+        for done, ticker in enumerate(pool.imap_unordered(_render_ticker, tasks), 1):
+            logger.info(f"Rendered {done}/{len(tasks)}: {ticker}")
 
 
 def main():
@@ -165,8 +235,17 @@ def main():
     args = parser.parse_args()
 
     try:
-        visualizer = Visualizer(args)
-        visualizer.visualize()
+        tickers = list(args.tickers)
+        if args.f:
+            tickers += BaseScraper(output_path=LINK, save_mode="rewrite")._tickers_from_file(Path(args.f))
+        if not tickers:
+            parser.error("Provide a ticker or a ticker file")
+
+        if args.f or args.o or len(tickers) > 1:  # A ticker file is a batch even if it lists one ticker
+            render_batch(args, tickers)
+        else:
+            with closing(Visualizer(args, tickers[0])) as visualizer:
+                visualizer.visualize()
         logger.info("Visualization completed")
     except Exception as e:
         logger.error(f"Visualization failed: {str(e)}")
@@ -0,0 +1,31 @@
+import io
+from typing import List, Optional
+
+from lxml import etree
+
+TABLE_INDEX = 1  # The trades table is the second tbody of a screener page
+
+
+def extract_table(text: str, n_columns: int) -> Optional[List[List[str]]]:
+    """Stripped cell texts of the trades table as one list per column, None if the page has no table
+
+    The page is walked with lxml until the trades table ends, rows with an unexpected
+    number of cells are skipped.
+    """
+    events = etree.iterparse(
+        io.BytesIO(text.encode('utf-8')), events=('end',), tag='tbody', html=True, encoding='utf-8'
+    )
+    for index, (_, tbody) in enumerate(events):
+        if index < TABLE_INDEX:
+            continue
+
+        columns = [[] for _ in range(n_columns)]
+        for row in tbody.iterchildren('tr'):
+            cells = row.findall('td')
+            if len(cells) != n_columns:
+                continue
+            for column, cell in zip(columns, cells):
+                column.append(''.join(cell.itertext()).strip())
+        return columns
+
+    return None
@@ -1,17 +1,29 @@
 import argparse
-import math
+import asyncio
+import datetime as dt
 import multiprocessing as mp
+import queue
+import time
 import pandas as pd
 import numpy as np
 import requests
 import logging
-from bs4 import BeautifulSoup
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote
 
 from arg_parser import get_openinsider_parser
-from base_scraper import BaseScraper, COLUMNS
-from settings import NUM_PROCESSES, USER_AGENT, CSV_SEP, LINK
+from base_scraper import BaseScraper, RecordBuffer, COLUMNS
+from openinsider_parser import extract_table
+from progress_journal import ProgressJournal
+from record_sink import RecordSink
+from rate_limiter import TokenBucket
+from settings import (
+    NUM_PROCESSES, OI_MAX_RATE, OI_CONCURRENCY, OI_PARSE_WORKERS, OI_TICKER_ATTEMPTS,
+    SINK_BATCH_ROWS, USER_AGENT, CSV_SEP, LINK
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +33,11 @@ columns_op = [  # openinsider column names
     'Price', 'Qty', 'Owned', 'deltaOwn', 'Value',
     '1d', '1w', '1m', '6m'
 ]
+PAGE_SIZE = 1000  # Rows per screener page, a full page means there are more
+PAGES_PER_BATCH = 4  # Later pages of a ticker fetched concurrently in async mode
+ALL_DATES = {'fd': '0', 'fdr': '', 'td': '0', 'tdr': ''}  # Screener filing/trade date filters, 0 means all
+
+worker_session = None  # requests session of a pool worker process, kept for all its tickers
 
 
 class OpenInsiderScraper(BaseScraper):
@@ -28,6 +45,15 @@ class OpenInsiderScraper(BaseScraper):
         self.args = args
         self.tickers = self._process_input(args)
         self.num_processes = args.processes or NUM_PROCESSES
+        self.resume = args.resume
+        self.use_async = args.use_async
+        self.max_rate = args.rate or OI_MAX_RATE
+        self.concurrency = args.concurrency or OI_CONCURRENCY
+        self.parse_workers = args.parse_workers or OI_PARSE_WORKERS
+        self.market = args.market
+        self.window = self._date_window(args) if args.market else None
+        self.stream = args.stream
+        self.sink = None
 
         # Initialize BaseScraper
         output_path = Path(args.s) if args.s else LINK
@@ -51,46 +77,107 @@ class OpenInsiderScraper(BaseScraper):
         return list(set(tickers))
 
     @staticmethod
-    def _split_into_chunks(lst: List, n_chunks: int) -> List[List]:
-        """Split list into equal chunks"""
-        chunk_size = math.ceil(len(lst) / n_chunks)
-        return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+    def _date_window(args: argparse.Namespace) -> Dict[str, str]:
+        """Build screener date filters of the market-wide window"""
+        if not args.sd:
+            raise ValueError("Market mode requires a start date (-sd)")
+        start = dt.date.fromisoformat(args.sd)
+        end = dt.date.fromisoformat(args.ed) if args.ed else dt.date.today()
+        if start > end:
+            raise ValueError(f"Start date {start} is after end date {end}")
+
+        date_range = f"{start:%m/%d/%Y} - {end:%m/%d/%Y}"
+        if args.trade_dates:
+            return {**ALL_DATES, 'td': '-1', 'tdr': date_range}
+        return {**ALL_DATES, 'fd': '-1', 'fdr': date_range}
+
+    @staticmethod
+    def _ticker_url(ticker: str, page: int = 1, window: Optional[Dict[str, str]] = None) -> str:
+        """Build screener URL listing trades of a ticker, or of all tickers when it is empty"""
+        window = window or ALL_DATES
+        return "http://openinsider.com/screener?s=" + ticker + \
+              f"&o=&pl=&ph=&ll=&lh=&fd={window['fd']}&fdr={quote(window['fdr'])}" + \
+              f"&td={window['td']}&tdr={quote(window['tdr'])}" + \
+              "&fdlyl=&fdlyh=&daysago=&xp=1&xs=1&xa=1&xd=1&xg=1&xf=1&xm=1&xx=1&xc=1&xw=1&vl=&vh=&ocl=&och=&sic1=-1&sicl=100&sich=9999&grp=0&nfl=&nfh=&nil=&nih=&nol=&noh=&v2l=&v2h=&oc2l=&oc2h=&sortcol=0" + \
+              f"&cnt={PAGE_SIZE}&page={page}"
 
     @staticmethod
-    def _scrape_page(ticker: str) -> pd.DataFrame:
-        """Scrape individual ticker page"""
-        url = "http://openinsider.com/screener?s=" + ticker + \
-              "&o=&pl=&ph=&ll=&lh=&fd=0&fdr=&td=0&tdr=&fdlyl=&fdlyh=&daysago=&xp=1&xs=1&xa=1&xd=1&xg=1&xf=1&xm=1&xx=1&xc=1&xw=1&vl=&vh=&ocl=&och=&sic1=-1&sicl=100&sich=9999&grp=0&nfl=&nfh=&nil=&nih=&nol=&noh=&v2l=&v2h=&oc2l=&oc2h=&sortcol=0&cnt=1000&page=1"
+    def _scrape_page(ticker: str, session: requests.Session,
+                     window: Optional[Dict[str, str]] = None) -> Optional[pd.DataFrame]:
+        """Scrape all result pages of a ticker, None if one couldn't be fetched"""
+        frames = []
+        page_number = 1
+        while True:
+            try:
+                page = session.get(OpenInsiderScraper._ticker_url(ticker, page_number, window), timeout=10)
+                page.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Failed to scrape {ticker or 'all tickers'} page {page_number}: {str(e)}")
+                return None
+
+            # Each page is cleaned on its own, so only one HTML tree is alive at a time
+            df = OpenInsiderScraper._parse_page(ticker or 'all tickers', page.text, page_number)
+            frames.append(df)
+            if len(df) < PAGE_SIZE:
+                break
+            page_number += 1
+
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    async def _fetch_page_async(self, session: aiohttp.ClientSession, limiter: TokenBucket,
+                                semaphore: asyncio.Semaphore, pool: ProcessPoolExecutor,
+                                ticker: str, page: int) -> pd.DataFrame:
+        """Fetch one result page under the politeness limit and parse it in the executor"""
+        async with semaphore:
+            await limiter.acquire()
+            async with session.get(self._ticker_url(ticker, page)) as response:
+                response.raise_for_status()
+                text = await response.text()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, self._parse_page, ticker, text, page)
+
+    async def _scrape_page_async(self, session: aiohttp.ClientSession, limiter: TokenBucket,
+                                 semaphore: asyncio.Semaphore, pool: ProcessPoolExecutor,
+                                 ticker: str) -> Optional[pd.DataFrame]:
+        """Async variant of _scrape_page, fetching later pages in concurrent batches"""
         try:
-            page = session.get(url, timeout=10)
-            page.raise_for_status()
+            frames = [await self._fetch_page_async(session, limiter, semaphore, pool, ticker, 1)]
+            next_page = 2
+            while len(frames[-1]) >= PAGE_SIZE:
+                batch = await asyncio.gather(*(
+                    self._fetch_page_async(session, limiter, semaphore, pool, ticker, page)
+                    for page in range(next_page, next_page + PAGES_PER_BATCH)
+                ))
+                next_page += PAGES_PER_BATCH
+                for df in batch:
+                    frames.append(df)
+                    if len(df) < PAGE_SIZE:  # Pages after the last one are empty
+                        break
         except Exception as e:
             logger.warning(f"Failed to scrape {ticker}: {str(e)}")
-            return []
+            return None
 
-        HTML = BeautifulSoup(page.text, "html.parser")
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
 
-        if len(HTML.find_all("tbody")) <= 1:  # if theres no querry
-            print("No insider trading data found for " + ticker)
-            return []
-
-        table = HTML.find_all("tbody")[1]  # table in html
+    @staticmethod
+    def _parse_page(ticker: str, text: str, page: int = 1) -> pd.DataFrame:
+        """Extract trades table of a ticker result page"""
+        table = extract_table(text, len(columns_op))
 
-        rows = []  # data frame with data about this ticker
-        for row in table.find_all('tr'):
-            cols = row.find_all('td')
-            cols = [ele.text.strip() for ele in cols]
-            rows.append(cols)
+        if table is None:  # if theres no querry
+            if page == 1:
+                logger.debug(f"No insider trading data found for {ticker}")
+            return pd.DataFrame(columns=COLUMNS)
 
-        logger.info(f"Scraped {len(rows)} transactions for {ticker}")
-        return OpenInsiderScraper._clean_rows(rows)
+        logger.info(f"Scraped {len(table[0])} transactions for {ticker} (page {page})")
+        return OpenInsiderScraper._clean_rows(dict(zip(columns_op, table)))
 
     @staticmethod
-    def _clean_rows(rows: List[List]) -> pd.DataFrame:
-        """Clean scraped rows and ensure standardized data types"""
-        df = pd.DataFrame(rows, columns=columns_op)
-        df['FC'] = np.nan
-        final_df = df.drop(columns=df.columns_op.difference(COLUMNS)).copy()
+    def _clean_rows(columns: Dict[str, List[str]]) -> pd.DataFrame:
+        """Clean scraped columns and ensure standardized data types"""
+        final_df = pd.DataFrame({name: values for name, values in columns.items() if name in COLUMNS})
+        final_df['FC'] = np.nan
 
         # Clean text formatting
         if CSV_SEP == ',':
@@ -118,40 +205,165 @@ class OpenInsiderScraper(BaseScraper):
         )
         final_df['Trade Date'] = pd.to_datetime(
             final_df['Trade Date'], errors='coerce'
-        ).dt.date  # Match existing data's date format
+        )
 
         return final_df
 
-    def _worker(self, tickers: List[str]) -> pd.DataFrame:
-        """Process a chunk of tickers (worker function)"""
-        df = pd.DataFrame(columns=columns_op)
-        with requests.Session() as session:
-            session.headers.update(USER_AGENT)
-            for ticker in tickers:
-                ticker_df = self._scrape_page(ticker, session)
-                df = pd.concat([df, ticker_df], ignore_index=True)
+    @staticmethod
+    def _init_worker():
+        """Open the session a pool worker process uses for all its tickers"""
+        global worker_session
+        worker_session = requests.Session()
+        worker_session.headers.update({'User-Agent': USER_AGENT})
 
+    @staticmethod
+    def _worker(ticker: str, attempt: int) -> Tuple[str, int, Optional[pd.DataFrame], str, float]:
+        """Scrape one ticker pulled from the shared task queue (worker function)"""
+        start = time.perf_counter()
+        df = OpenInsiderScraper._scrape_page(ticker, worker_session)
+        return ticker, attempt, df, mp.current_process().name, time.perf_counter() - start
+
+    async def _scrape_async(self, tickers: List[str], records: RecordBuffer):
+        """Async scraping controller sharing one pooled client under a politeness limit"""
+        limiter = TokenBucket(self.max_rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        logger.info(f"Scraping {len(tickers)} tickers at up to {self.max_rate} req/s "
+                    f"with {self.concurrency} requests in flight and {self.parse_workers} parser processes")
+
+        async def scrape_ticker(session: aiohttp.ClientSession, pool: ProcessPoolExecutor, ticker: str):
+            for attempt in range(1, OI_TICKER_ATTEMPTS + 1):
+                df = await self._scrape_page_async(session, limiter, semaphore, pool, ticker)
+                if df is not None:
+                    self._finish_ticker(ticker, df, records)
+                    return
+            logger.error(f"Giving up on {ticker} after {OI_TICKER_ATTEMPTS} attempts")
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            async with aiohttp.ClientSession(
+                headers={'User-Agent': USER_AGENT}, connector=connector, timeout=timeout
+            ) as session:
+                results = await asyncio.gather(
+                    *(scrape_ticker(session, pool, ticker) for ticker in tickers), return_exceptions=True
+                )
+
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to process {ticker}: {str(result)}")
+
+    def _scrape_market(self) -> pd.DataFrame:
+        """Scrape all trades of the date window with one paged screener query"""
+        date_range = self.window['tdr'] or self.window['fdr']
+        kind = 'traded' if self.window['tdr'] else 'filed'
+        logger.info(f"Scraping all trades {kind} {date_range}")
+
+        with requests.Session() as session:
+            session.headers.update({'User-Agent': USER_AGENT})
+            df = self._scrape_page('', session, self.window)
+        if df is None:
+            raise RuntimeError(f"Failed to scrape trades {kind} {date_range}")
+
+        if self.tickers:
+            df = df[df['Ticker'].isin(self.tickers)].reset_index(drop=True)
+            logger.info(f"Kept {len(df)} trades of {len(self.tickers)} selected tickers")
         return df
 
+    def _finish_ticker(self, ticker: str, df: pd.DataFrame, records: RecordBuffer):
+        """Journal rows of a finished ticker, or stream them to the output which journals the ticker once written"""
+        if self.sink:
+            self.sink.write(df, ticker)
+        else:
+            self.journal.record(ticker, df)
+            records.add_frame(df)
+
     def scrape(self) -> pd.DataFrame:
-        """Main scraping controller"""
+        """Main scraping controller, in streaming mode records are written to the output and not returned"""
+        if self.market:
+            df = self._standardize_types(self._scrape_market())
+            if self.stream:
+                sink = RecordSink(self.output_path, self.save_mode, SINK_BATCH_ROWS)
+                sink.write(df)
+                sink.close()
+            return df
+
         if not self.tickers:
             logger.warning("No tickers provided for scraping")
             return pd.DataFrame()
 
-        # Adjust process count based on workload
-        while len(self.tickers) < 20 * self.num_processes and self.num_processes > 1:
-            self.num_processes //= 2
-
-        chunks = self._split_into_chunks(self.tickers, self.num_processes)
+        # Finished tickers are journaled as they complete, so an interrupted run can be resumed
+        self.journal = ProgressJournal(ProgressJournal.path_for(self.output_path))
+        completed = self.journal.start(self.resume)
+        tickers = [ticker for ticker in self.tickers if ticker not in completed]
+
+        if self.stream:
+            self.sink = RecordSink(
+                self.output_path, self.save_mode, SINK_BATCH_ROWS, journal=self.journal, resume=self.resume
+            )
+
+        records = RecordBuffer()
+        if len(tickers) < len(self.tickers):
+            # Rows staged by a run without streaming, streamed runs leave none
+            resumed = self.journal.load(set(self.tickers) & completed)
+            if self.sink:
+                self.sink.write(resumed)
+            else:
+                records.add_frame(resumed)
+
+        if tickers and self.use_async:
+            asyncio.run(self._scrape_async(tickers, records))
+        elif tickers:
+            self._scrape_pool(tickers, records)
+
+        if self.sink:
+            self.sink.close()
+        self.journal.note_unfinished(self.tickers)
+        if self.sink:
+            self._close_journal()
+        return self._standardize_types(records.to_frame())
+
+    def _scrape_pool(self, tickers: List[str], records: RecordBuffer):
+        """Process pool controller, idle workers pull the next ticker from the shared task queue
+
+        Failed tickers go to the back of the queue until they run out of attempts.
+        """
+        num_processes = min(self.num_processes, len(tickers))
+        results = queue.Queue()
+        busy = {}  # Worker name -> (tickers processed, seconds spent)
+
+        logger.info(f"Scraping {len(tickers)} tickers using {num_processes} processes")
+
+        start = time.perf_counter()
+        with mp.Pool(processes=num_processes, initializer=self._init_worker) as pool:
+            def submit(ticker: str, attempt: int):
+                pool.apply_async(self._worker, (ticker, attempt), callback=results.put,
+                                 error_callback=lambda e: results.put((ticker, attempt, e, None, 0.0)))
 
-        logger.info(f"Scraping {len(self.tickers)} tickers using {self.num_processes} processes")
-
-        with mp.Pool(processes=self.num_processes) as pool:
-            results = pool.imap_unordered(self._worker, chunks)
-            final_df = pd.concat(results, ignore_index=True)
-
-        return final_df
+            for ticker in tickers:
+                submit(ticker, 1)
+
+            pending = len(tickers)
+            while pending:
+                ticker, attempt, df, worker, seconds = results.get()
+                if worker is not None:
+                    count, total = busy.get(worker, (0, 0.0))
+                    busy[worker] = (count + 1, total + seconds)
+
+                if isinstance(df, pd.DataFrame):
+                    self._finish_ticker(ticker, df, records)
+                elif attempt < OI_TICKER_ATTEMPTS:
+                    logger.warning(f"Requeued {ticker} ({attempt}/{OI_TICKER_ATTEMPTS})")
+                    submit(ticker, attempt + 1)
+                    continue
+                else:  # Failed tickers stay unfinished so --resume retries them
+                    logger.error(f"Giving up on {ticker} after {attempt} attempts")
+                pending -= 1
+
+        elapsed = time.perf_counter() - start
+        for worker, (count, total) in sorted(busy.items()):
+            logger.info(f"{worker}: {count} tickers, busy {total:.1f}s of {elapsed:.1f}s "
+                        f"({total / elapsed:.0%} utilization)")
 
 
 def main():
@@ -161,7 +373,8 @@ def main():
     try:
         scraper = OpenInsiderScraper(args)
         df = scraper.scrape()
-        scraper.save_results(df)
+        if not scraper.stream:
+            scraper.save_results(df)
         logger.info("Scraping completed successfully")
     except Exception as e:
         logger.error(f"Scraping failed: {str(e)}")
@@ -0,0 +1,118 @@
+import shutil
+import uuid
+import datetime as dt
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+SCHEMA = pa.schema([
+    ('X', pa.string()),
+    ('Filing Date', pa.timestamp('us')),
+    ('Trade Date', pa.date32()),
+    ('Ticker', pa.string()),
+    ('Insider Name', pa.string()),
+    ('Title', pa.string()),
+    ('Trade Type', pa.string()),
+    ('Price', pa.float64()),
+    ('Qty', pa.int64()),
+    ('Value', pa.float64()),
+    ('FC', pa.string()),
+    ('year', pa.int32()),  # Filing year, partition key only
+])
+STORED_COLUMNS = [field.name for field in SCHEMA if field.name != 'year']
+PARTITIONING = ds.partitioning(pa.schema([('Ticker', pa.string()), ('year', pa.int32())]), flavor='hive')
+
+
+class ParquetStore:
+    """Parquet dataset of transactions partitioned by ticker and filing year
+
+    Column types are stored in the files, and filters on ticker and filing date are
+    pushed down so only matching partitions and row groups are read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _read(self, condition: Optional[ds.Expression], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read matching rows of the dataset, keeping integer columns nullable"""
+        dataset = ds.dataset(self.path, schema=SCHEMA, format='parquet', partitioning=PARTITIONING)
+        table = dataset.to_table(columns=columns or STORED_COLUMNS, filter=condition)
+        return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get, date_as_object=False)
+
+    @staticmethod
+    def _filter(tickers: Optional[Iterable[str]], start: Optional[dt.datetime], end: Optional[dt.datetime],
+                trade_types: Optional[Iterable[str]] = None) -> Optional[ds.Expression]:
+        """Build dataset filter, year bounds let partitions be skipped without opening them"""
+        conditions = []
+        if tickers is not None:
+            conditions.append(pc.field('Ticker').isin(list(tickers)))
+        if trade_types is not None:
+            conditions.append(pc.field('Trade Type').isin(list(trade_types)))
+        if start is not None:
+            conditions.append(pc.field('year') >= start.year)
+            conditions.append(pc.field('Filing Date') >= pa.scalar(start, pa.timestamp('us')))
+        if end is not None:
+            conditions.append(pc.field('year') <= end.year)
+            conditions.append(pc.field('Filing Date') <= pa.scalar(end, pa.timestamp('us')))
+
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def read(self, tickers: Optional[Iterable[str]] = None, start: Optional[dt.datetime] = None,
+             end: Optional[dt.datetime] = None, trade_types: Optional[Iterable[str]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read transactions of the tickers and trade types filed between start and end"""
+        return self._read(self._filter(tickers, start, end, trade_types), columns)
+
+    def read_partitions(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Read stored transactions of the ticker and year partitions the given records fall into"""
+        if not self.path.exists() or df.empty:
+            return pd.DataFrame()
+
+        # Records without ticker or filing date live in the null partitions
+        tickers = df['Ticker']
+        years = pd.to_datetime(df['Filing Date'], errors='coerce').dt.year
+        ticker_condition = pc.field('Ticker').isin(tickers.dropna().unique().tolist())
+        if tickers.isna().any():
+            ticker_condition = ticker_condition | pc.field('Ticker').is_null()
+        year_condition = pc.field('year').isin(years.dropna().astype(int).unique().tolist())
+        if years.isna().any():
+            year_condition = year_condition | pc.field('year').is_null()
+        return self._read(ticker_condition & year_condition)
+
+    @staticmethod
+    def _to_table(df: pd.DataFrame) -> pa.Table:
+        """Convert records to the stored schema"""
+        df = df.reindex(columns=STORED_COLUMNS)
+        df['Filing Date'] = pd.to_datetime(df['Filing Date'], errors='coerce')
+        df['Trade Date'] = pd.to_datetime(df['Trade Date'], errors='coerce').dt.date
+        for column in ('Price', 'Value'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+        df['Qty'] = pd.to_numeric(df['Qty'], errors='coerce').astype('Int64')
+        for column in ('X', 'Ticker', 'Insider Name', 'Title', 'Trade Type', 'FC'):
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+        df['year'] = df['Filing Date'].dt.year.astype('Int32')
+        return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+    def write(self, df: pd.DataFrame, mode: str):
+        """Write records
+
+        'rewrite' replaces the dataset, 'append' adds files, and 'partitions' replaces
+        only the partitions the records fall into.
+        """
+        if mode == 'rewrite' and self.path.exists():
+            shutil.rmtree(self.path)
+
+        behavior = 'delete_matching' if mode == 'partitions' else 'overwrite_or_ignore'
+        ds.write_dataset(
+            self._to_table(df), self.path, format='parquet', partitioning=PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",  # Unique names so appends never clobber files
+            existing_data_behavior=behavior
+        )
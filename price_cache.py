@@ -0,0 +1,129 @@
+import datetime as dt
+import logging
+import sqlite3
+import pandas as pd
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# Price sources take a ticker and an inclusive date range and return daily rows indexed by date
+PriceSource = Callable[[str, dt.date, dt.date], pd.DataFrame]
+
+
+def fetch_yfinance(ticker: str, start: dt.date, end: dt.date) -> pd.DataFrame:
+    """Daily adjusted prices from Yahoo Finance"""
+    import yfinance as yf  # Only needed when prices are downloaded
+
+    data = yf.download(ticker, start=start, end=end + dt.timedelta(days=1), auto_adjust=True, progress=False)
+    # Failed downloads come back empty instead of raising, and mustn't be cached as no trading.
+    # yfinance only reports them in a private dict, which older and newer versions may lack.
+    errors = getattr(getattr(yf, 'shared', None), '_ERRORS', None) or {}
+    error = errors.get(ticker.upper())
+    if error:
+        raise RuntimeError(error)
+    if isinstance(data.columns, pd.MultiIndex):  # Newer versions add the ticker as a column level
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+
+def csv_folder_source(folder: Path) -> PriceSource:
+    """Source reading daily prices from <folder>/<TICKER>.csv files with a Date column"""
+    def fetch(ticker: str, start: dt.date, end: dt.date) -> pd.DataFrame:
+        path = folder / f"{ticker}.csv"
+        if not path.exists():  # Raised, so the dates are fetched again once the file is added
+            raise FileNotFoundError(f"No price file {path}")
+        data = pd.read_csv(path, parse_dates=['Date'], index_col='Date')
+        return data.loc[pd.Timestamp(start):pd.Timestamp(end)]
+    return fetch
+
+
+class PriceCache:
+    """Per-ticker daily OHLC history persisted in SQLite
+
+    The date range fetched so far is stored for every ticker, so later requests only
+    fetch the missing dates before or after it. Offline, or without a source, charts
+    are served from stored prices only.
+    """
+
+    def __init__(self, path: Path, source: Optional[PriceSource] = fetch_yfinance, offline: bool = False):
+        self.path = path
+        self.source = source
+        self.offline = offline or source is None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices (ticker TEXT, date TEXT, open REAL, high REAL, low REAL, "
+                "close REAL, volume REAL, PRIMARY KEY (ticker, date))"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS coverage (ticker TEXT PRIMARY KEY, start TEXT, end TEXT)")
+
+    def _coverage(self, ticker: str) -> Optional[Tuple[dt.date, dt.date]]:
+        """Date range already fetched for the ticker"""
+        row = self.conn.execute("SELECT start, end FROM coverage WHERE ticker = ?", (ticker,)).fetchone()
+        return (dt.date.fromisoformat(row[0]), dt.date.fromisoformat(row[1])) if row else None
+
+    @staticmethod
+    def _missing(coverage: Optional[Tuple[dt.date, dt.date]], start: dt.date,
+                 end: dt.date) -> List[Tuple[dt.date, dt.date]]:
+        """Ranges to fetch so the stored range covers start to end, and stays contiguous"""
+        if coverage is None:
+            return [(start, end)]
+        covered_start, covered_end = coverage
+        missing = []
+        if start < covered_start:
+            missing.append((start, covered_start - dt.timedelta(days=1)))
+        if end > covered_end:
+            missing.append((covered_end + dt.timedelta(days=1), end))
+        return missing
+
+    def _store(self, ticker: str, data: pd.DataFrame, covered: Optional[Tuple[dt.date, dt.date]]):
+        """Save fetched rows and extend the stored range by the covered dates in one transaction"""
+        data = data.reindex(columns=PRICE_COLUMNS).dropna(subset=['Close'])
+        dates = pd.to_datetime(data.index).strftime('%Y-%m-%d')
+        rows = [(ticker, date, *map(float, values)) for date, values in zip(dates, data.to_numpy(dtype='float64'))]
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if covered:
+                start, end = covered
+                coverage = self._coverage(ticker)
+                if coverage:
+                    start, end = min(start, coverage[0]), max(end, coverage[1])
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)", (ticker, start.isoformat(), end.isoformat())
+                )
+
+    def _update(self, ticker: str, start: dt.date, end: dt.date):
+        """Fetch dates of the range that aren't stored yet"""
+        # Today's prices aren't final, so they are stored but fetched again next time
+        settled_end = dt.date.today() - dt.timedelta(days=1)
+        for missing_start, missing_end in self._missing(self._coverage(ticker), start, end):
+            logger.info(f"Fetching {ticker} prices from {missing_start} to {missing_end}")
+            try:
+                data = self.source(ticker, missing_start, missing_end)
+            except Exception as e:
+                logger.error(f"Error fetching {ticker} prices: {str(e)}")
+                continue
+            if data.empty:  # Still marked as fetched, e.g. dates before listing or around holidays
+                logger.info(f"No {ticker} prices between {missing_start} and {missing_end}")
+            covered = (missing_start, min(missing_end, settled_end)) if missing_start <= settled_end else None
+            self._store(ticker, data, covered)
+
+    def history(self, ticker: str, start: dt.date, end: dt.date) -> pd.DataFrame:
+        """Daily prices of the ticker from start to end, indexed by Date"""
+        if not self.offline:
+            self._update(ticker, start, end)
+        elif self._missing(self._coverage(ticker), start, end):
+            logger.warning(f"Offline: {ticker} prices from {start} to {end} are only partially cached")
+
+        return pd.read_sql(
+            "SELECT date AS Date, open AS Open, high AS High, low AS Low, close AS Close, volume AS Volume "
+            "FROM prices WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+            self.conn, params=(ticker, start.isoformat(), end.isoformat()), parse_dates=['Date'], index_col='Date'
+        )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,94 @@
+import datetime as dt
+import logging
+import sqlite3
+import pandas as pd
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from base_scraper import BaseScraper, COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressJournal:
+    """SQLite staging journal of finished work units (CIKs or tickers) and their rows
+
+    Every unit is committed together with its rows as soon as it finishes, so an
+    interrupted scrape can be resumed without fetching finished units again. Units that
+    failed leave the journal in place after saving, so --resume retries just them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.failed: Set[str] = set()  # Units of this run that didn't finish
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        columns = ', '.join(f'"{column}"' for column in COLUMNS)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS units (unit TEXT PRIMARY KEY, rows INTEGER, finished TEXT)")
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS staged (unit TEXT, {columns})")
+            # Rows of a unit that was interrupted while being recorded
+            self.conn.execute("DELETE FROM staged WHERE unit NOT IN (SELECT unit FROM units)")
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        """Journal location next to the output file"""
+        return output_path.with_name(output_path.name + '.journal')
+
+    def start(self, resume: bool) -> Set[str]:
+        """Return units finished by an interrupted run when resuming, otherwise start over"""
+        if not resume:
+            self.reset()
+            return set()
+
+        completed = self.completed_units()
+        logger.info(f"Resuming from {self.path}: {len(completed)} units already finished")
+        return completed
+
+    def reset(self):
+        """Forget all recorded units"""
+        with self.conn:
+            self.conn.execute("DELETE FROM staged")
+            self.conn.execute("DELETE FROM units")
+
+    def completed_units(self) -> Set[str]:
+        """Units finished by earlier runs"""
+        return {unit for unit, in self.conn.execute("SELECT unit FROM units")}
+
+    def record(self, unit: str, df: pd.DataFrame):
+        """Durably store rows of a finished unit"""
+        if not df.empty:
+            df.reindex(columns=COLUMNS).assign(unit=unit).to_sql('staged', self.conn, if_exists='append', index=False)
+        self.mark(unit, len(df))
+
+    def mark(self, unit: str, rows: int):
+        """Durably store a finished unit whose rows are already saved in the output"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO units VALUES (?, ?, ?)",
+                (unit, rows, dt.datetime.now().isoformat(timespec='seconds'))
+            )
+
+    def note_unfinished(self, units: Iterable[str]) -> Set[str]:
+        """Remember units of this run that weren't recorded as finished"""
+        self.failed = set(units) - self.completed_units()
+        return self.failed
+
+    def drop_staged(self):
+        """Forget staged rows once they are saved to the output, keeping the finished units"""
+        with self.conn:
+            self.conn.execute("DELETE FROM staged")
+
+    def load(self, units: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Rows of finished units, all of them when no units are given"""
+        query = "SELECT * FROM staged WHERE unit IN (SELECT unit FROM units)"
+        df = pd.read_sql(query, self.conn)
+        if units is not None:
+            df = df[df['unit'].isin(set(units))]
+        return BaseScraper._standardize_types(df.drop(columns='unit'))
+
+    def close(self, remove: bool = False):
+        """Close the journal, removing it once its rows are saved"""
+        self.conn.close()
+        if remove:
+            self.path.unlink(missing_ok=True)
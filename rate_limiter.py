@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token-bucket limiter shared by all requests, usable from async and blocking code"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Add tokens accumulated since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _take(self) -> float:
+        """Consume a token if available, otherwise return seconds to wait"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        async with self._lock:  # Serialize waiters so tokens are handed out in order
+            while (wait := self._take()) > 0:
+                await asyncio.sleep(wait)
+
+    def acquire_blocking(self):
+        """Blocking variant of acquire for the synchronous request path"""
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket that backs off when throttled and slowly ramps back to its maximum rate
+
+    Throttling halves the rate and pauses all requests for a cooldown that doubles while
+    throttling continues. Every successful request raises the rate by a small step.
+    """
+
+    DECREASE_FACTOR = 0.5
+    INCREASE_STEP = 0.01  # Fraction of the maximum rate added per successful request
+
+    def __init__(self, max_rate: float, capacity: float = 1.0, min_rate: float = 0.1, cooldown: float = 10.0):
+        super().__init__(max_rate, capacity)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.paused_until = 0.0
+
+        # Statistics
+        self.started = time.monotonic()
+        self.successes = 0
+        self.throttles = 0
+
+    def _take(self) -> float:
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        return super()._take()
+
+    def on_success(self):
+        """Ramp rate back towards the maximum"""
+        self.successes += 1
+        self.cooldown = self.base_cooldown
+        self._refill()  # Accrue tokens at the old rate before changing it
+        self.rate = min(self.max_rate, self.rate + self.max_rate * self.INCREASE_STEP)
+
+    def on_throttle(self):
+        """Lower rate and pause after a throttled request"""
+        self.throttles += 1
+        now = time.monotonic()
+        if now < self.paused_until:
+            return  # Requests already in flight when throttling started don't count again
+
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+        self.tokens = 0
+        self.paused_until = now + self.cooldown
+        logger.warning(f"SEC throttling detected, pausing {self.cooldown:.0f}s and lowering rate to {self.rate:.2f} req/s")
+        self.cooldown = min(self.cooldown * 2, 600)
+
+    def achieved_rate(self) -> float:
+        """Successful requests per second since the limiter was created"""
+        elapsed = time.monotonic() - self.started
+        return self.successes / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.successes} requests at {self.achieved_rate():.2f} req/s achieved, "
+                f"{self.throttles} throttled, final rate {self.rate:.2f} req/s")
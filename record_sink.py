@@ -0,0 +1,109 @@
+import logging
+import sqlite3
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from base_scraper import BaseScraper, RecordBuffer
+from fingerprint_index import FingerprintIndex, fingerprints
+from progress_journal import ProgressJournal
+from settings import CSV_SEP
+
+logger = logging.getLogger(__name__)
+
+
+class RecordSink:
+    """Writes records to the output file in batches while scraping instead of once at the end
+
+    SQLite outputs get one insert transaction per batch, in merge mode only of records
+    whose key isn't stored yet.
+    CSV outputs get appended chunks. In merge mode every batch is looked up in the
+    fingerprint index first and only unseen records are appended, and the index is
+    saved with each chunk, so later merges don't have to rebuild it.
+    Units of work are marked finished in the journal once their rows are written.
+    """
+
+    def __init__(self, output_path: Path, save_mode: str, batch_rows: int,
+                 journal: Optional[ProgressJournal] = None, resume: bool = False):
+        self.output_path = output_path
+        self.save_mode = save_mode
+        self.batch_rows = batch_rows
+        self.journal = journal
+        self.suffix = output_path.suffix.lower()
+        self.buffer = RecordBuffer()
+        self.units: List[Tuple[str, int]] = []  # Units whose rows are in the buffer
+        self.written = 0
+        self.skipped = 0  # Records already stored
+
+        if self.suffix not in ('.csv', '.db'):
+            raise ValueError(f"Streaming requires a .csv or .db output, got {output_path.suffix}")
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        if save_mode == 'rewrite' and not resume:  # A resumed run keeps what it already wrote
+            self._clear()
+
+        # Appends don't keep the index, it's rebuilt by the next merge like after a file append
+        self.index = None
+        if self.suffix == '.csv' and save_mode != 'append':
+            self.index = FingerprintIndex(output_path).load()
+
+    def _clear(self):
+        """Remove previously stored records"""
+        if self.suffix == '.db':
+            with sqlite3.connect(self.output_path) as conn:
+                conn.execute("DROP TABLE IF EXISTS transactions")
+        else:
+            self.output_path.unlink(missing_ok=True)
+
+    def write(self, df: pd.DataFrame, unit: Optional[str] = None):
+        """Queue records of a finished unit, writing them out once a batch is full"""
+        self.buffer.add_frame(df)
+        if unit is not None:
+            self.units.append((unit, len(df)))
+        if len(self.buffer) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """Write queued records to the output"""
+        if len(self.buffer):
+            df = self.buffer.to_frame()
+            self.buffer = RecordBuffer()
+
+            if self.suffix == '.db':
+                # A rewrite cleared the table when the sink was opened
+                written = BaseScraper._insert_db(
+                    self.output_path, df, 'merge' if self.save_mode == 'merge' else 'append'
+                )
+            else:
+                written = self._append_csv(df)
+
+            self.written += written
+            logger.info(f"Wrote {written} records to {self.output_path}")
+
+        if self.journal:
+            for unit, rows in self.units:
+                self.journal.mark(unit, rows)
+        self.units = []
+
+    def _append_csv(self, df: pd.DataFrame) -> int:
+        """Append a batch to the CSV output, in merge mode only records missing from the index"""
+        if self.save_mode == 'merge':
+            total = len(df)
+            df, hashes = self.index.unseen(df)
+            self.skipped += total - len(df)
+        elif self.index is not None:
+            hashes = fingerprints(df)
+
+        if not df.empty:
+            header = not self.output_path.exists() or self.output_path.stat().st_size == 0
+            df.to_csv(self.output_path, mode='a', header=header, index=False, sep=CSV_SEP)
+            if self.index is not None:
+                self.index.add(hashes)
+        return len(df)
+
+    def close(self):
+        """Write remaining records"""
+        self.flush()
+        if self.skipped:
+            logger.info(f"Skipped {self.skipped} records already in {self.output_path}")
+        logger.info(f"Streamed {self.written} records to {self.output_path}")
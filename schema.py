@@ -0,0 +1,48 @@
+import pandas as pd
+from typing import List
+
+COLUMNS = [
+    'X', 'Filing Date', 'Trade Date', 'Ticker', 'Insider Name', 'Title',
+    'Trade Type', 'Price', 'Qty', 'Value', 'FC'
+]
+KEY_COLUMNS = [  # Columns identifying a trade when removing duplicates
+    'Filing Date', 'Trade Date', 'Ticker', 'Insider Name',
+    'Trade Type', 'Price', 'Qty', 'Value'
+]
+# In-memory types of transaction frames. Repetitive strings are categoricals, both dates
+# are datetime64 and numbers are fixed-width, so no column holds Python objects except
+# the accession number, which is unique per filing.
+DTYPES = {
+    'X': 'category',
+    'Filing Date': 'datetime64[ns]',
+    'Trade Date': 'datetime64[ns]',
+    'Ticker': 'category',
+    'Insider Name': 'category',
+    'Title': 'category',
+    'Trade Type': 'category',
+    'Price': 'float64',
+    'Qty': 'Int64',
+    'Value': 'float64',
+    'FC': 'object',
+}
+CATEGORY_COLUMNS = [column for column, dtype in DTYPES.items() if dtype == 'category']
+DATE_COLUMNS = ['Filing Date', 'Trade Date']
+
+
+def apply_schema(df: pd.DataFrame, columns: List[str] = COLUMNS) -> pd.DataFrame:
+    """Reindex a transactions frame to the columns and convert them to their schema types
+
+    Values that can't be converted become missing. Dates read from files can mix values
+    with and without a time part, so they are parsed as ISO 8601 instead of inferring one
+    format from the first value.
+    """
+    df = df.reindex(columns=columns)
+    for column in columns:
+        dtype = DTYPES[column]
+        if dtype == 'category':
+            df[column] = df[column].astype('category')
+        elif column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601').astype(dtype)
+        elif dtype != 'object':
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+    return df
@@ -7,9 +7,25 @@ load_dotenv()
 # File paths
 SCRIPT_DIR = Path(__file__).resolve().parent
 LINK = SCRIPT_DIR / os.getenv("LINK", "scrapes.csv")
+SEC_CACHE_DIR = SCRIPT_DIR / os.getenv("SEC_CACHE_DIR", "sec_cache")
+CIK_MAP_PATH = SCRIPT_DIR / os.getenv("CIK_MAP_PATH", "cik_map.json")
+PRICE_CACHE_PATH = SCRIPT_DIR / os.getenv("PRICE_CACHE_PATH", "price_cache.db")
 
 # Scraping constants
 CSV_SEP = os.getenv("CSV_SEP", ";")
 NUM_PROCESSES = int(os.getenv("NUM_PROCESSES", 1))
 SEC_REQUEST_DELAY = float(os.getenv("SEC_BET_REQ", 0.2))
+SEC_MAX_RATE = float(os.getenv("SEC_MAX_RATE", 8))  # Requests per second in async mode, under the SEC limit of 10
+SEC_CONCURRENCY = int(os.getenv("SEC_CONCURRENCY", 8))  # Requests in flight in async mode
+SEC_CACHE_MAX_MB = float(os.getenv("SEC_CACHE_MAX_MB", 2048))
+SEC_PARSE_WORKERS = int(os.getenv("SEC_PARSE_WORKERS", os.cpu_count() or 1))  # Parser processes in pipeline mode
+SEC_QUEUE_SIZE = int(os.getenv("SEC_QUEUE_SIZE", 64))  # Filings buffered between pipeline stages
+SEC_THROTTLE_COOLDOWN = float(os.getenv("SEC_THROTTLE_COOLDOWN", 10))  # Initial pause in seconds after throttling
+SEC_THROTTLE_RETRIES = int(os.getenv("SEC_THROTTLE_RETRIES", 8))  # Times a throttled request is re-queued
+OI_MAX_RATE = float(os.getenv("OI_MAX_RATE", 5))  # OpenInsider requests per second in async mode
+OI_CONCURRENCY = int(os.getenv("OI_CONCURRENCY", 4))  # OpenInsider requests in flight in async mode
+OI_PARSE_WORKERS = int(os.getenv("OI_PARSE_WORKERS", 2))  # OpenInsider page parser processes in async mode
+OI_TICKER_ATTEMPTS = int(os.getenv("OI_TICKER_ATTEMPTS", 3))  # Tries per OpenInsider ticker before giving up
+SINK_BATCH_ROWS = int(os.getenv("SINK_BATCH_ROWS", 10000))  # Records per write in streaming mode
+CIK_MAP_TTL_HOURS = float(os.getenv("CIK_MAP_TTL_HOURS", 24))
 USER_AGENT = os.getenv("USER_AGENT", "InsiderTradingBot/1.0")
\ No newline at end of file
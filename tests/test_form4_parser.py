@@ -0,0 +1,61 @@
+from form4_parser import Form4Document
+from SEC_insider_scraper import SECScraper
+
+
+def _submission(relationship: str, remarks: str = '') -> str:
+    """Full text submission of a Form 4 with one open market purchase"""
+    return f"""<SEC-HEADER>
+<ACCEPTANCE-DATETIME>20240102163015
+</SEC-HEADER>
+<XML>
+<ownershipDocument>
+    <issuer><issuerTradingSymbol>AAPL</issuerTradingSymbol></issuer>
+    <reportingOwner>
+        <reportingOwnerId><rptOwnerName>Doe John</rptOwnerName></reportingOwnerId>
+        <reportingOwnerRelationship>{relationship}</reportingOwnerRelationship>
+    </reportingOwner>
+    <nonDerivativeTable>
+        <nonDerivativeTransaction>
+            <transactionDate><value>2024-01-02</value></transactionDate>
+            <transactionCoding><transactionCode>P</transactionCode></transactionCoding>
+            <transactionAmounts>
+                <transactionShares><value>100</value></transactionShares>
+                <transactionPricePerShare><value>185.5</value></transactionPricePerShare>
+                <transactionAcquiredDisposedCode><value>A</value></transactionAcquiredDisposedCode>
+            </transactionAmounts>
+        </nonDerivativeTransaction>
+    </nonDerivativeTable>
+    {remarks}
+</ownershipDocument>
+</XML>
+"""
+
+
+def test_empty_officer_title_is_empty_string():
+    document = Form4Document(_submission('<isOfficer>1</isOfficer><officerTitle/>', '<remarks/>'))
+
+    assert document.get_relationship()['officerTitle'] == ''
+    assert document.remarks == ''
+
+
+def test_filing_with_empty_officer_title_is_parsed():
+    text = _submission('<isOfficer>1</isOfficer><isDirector>1</isDirector><officerTitle/>')
+
+    transactions = SECScraper._parse_transactions(text, '0000320193-24-000001')
+
+    assert len(transactions) == 1
+    assert transactions[0]['Title'] == 'Director'
+    assert transactions[0]['Ticker'] == 'AAPL'
+    assert transactions[0]['Qty'] == 100
+
+
+def test_empty_officer_title_without_other_roles():
+    text = _submission('<isOfficer>true</isOfficer><officerTitle></officerTitle>', '<remarks></remarks>')
+
+    assert SECScraper._parse_transactions(text, '0000320193-24-000001')[0]['Title'] == 'No Title'
+
+
+def test_see_remarks_title_uses_remarks():
+    text = _submission('<isOfficer>1</isOfficer><officerTitle>See Remarks</officerTitle>', '<remarks>CEO</remarks>')
+
+    assert SECScraper._parse_transactions(text, '0000320193-24-000001')[0]['Title'] == 'CEO'
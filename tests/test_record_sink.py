@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from base_scraper import BaseScraper
+from fingerprint_index import FingerprintIndex
+from record_sink import RecordSink
+from schema import apply_schema
+
+
+def _trades(tickers, price=105.0) -> pd.DataFrame:
+    return apply_schema(pd.DataFrame({
+        'Filing Date': '2024-01-02 16:30:00', 'Trade Date': '2024-01-02', 'Ticker': tickers,
+        'Insider Name': 'Doe John', 'Title': 'CEO', 'Trade Type': 'S - Sale', 'Price': price, 'Qty': -10,
+        'Value': -1050.0
+    }))
+
+
+def test_merge_stream_appends_only_unseen_records(tmp_path):
+    output = tmp_path / 'out.csv'
+    BaseScraper(output, 'merge').save_results(_trades(['AAPL', 'MSFT']))
+
+    sink = RecordSink(output, 'merge', batch_rows=2)
+    sink.write(_trades(['AAPL', 'NVDA'], price=105), 'batch1')  # Stored AAPL written as 105 instead of 105.0
+    sink.write(_trades(['NVDA', 'TSLA']), 'batch2')
+    sink.close()
+
+    stored = BaseScraper(output, 'merge').load_existing_data()
+    assert sorted(stored['Ticker']) == ['AAPL', 'MSFT', 'NVDA', 'TSLA']
+    assert (sink.written, sink.skipped) == (2, 2)
+
+    # The index was saved with the last chunk, so the next merge needn't rebuild it
+    index = FingerprintIndex(output)
+    with np.load(index.path) as data:
+        assert tuple(data['stamp']) == index._stamp()
+        assert len(data['hashes']) == 4
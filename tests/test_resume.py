@@ -0,0 +1,52 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from arg_parser import get_sec_parser
+from progress_journal import ProgressJournal
+from SEC_insider_scraper import SECScraper
+
+FILINGS = {'0000000001': ['0000000001-24-000001'], '0000000002': ['0000000002-24-000001']}
+
+
+def _record(cik: str) -> dict:
+    return {
+        'X': '', 'Filing Date': dt.datetime(2024, 1, 2, 16, 30), 'Trade Date': dt.date(2024, 1, 2),
+        'Ticker': f"T{cik[-1]}", 'Insider Name': 'Doe John', 'Title': 'Director', 'Trade Type': 'P - Purchase',
+        'Price': 10.0, 'Qty': 100, 'Value': 1000, 'FC': FILINGS[cik][0]
+    }
+
+
+def _scraper(monkeypatch, output: Path, failing: set, listed: list, *flags: str) -> SECScraper:
+    """Sync scraper over two CIKs whose filings fail for the CIKs in failing"""
+    monkeypatch.setattr(SECScraper, '_get_filings', lambda self, cik: listed.append(cik) or FILINGS[cik])
+    monkeypatch.setattr(
+        SECScraper, '_process_filing', lambda self, acc, cik: None if cik in failing else [_record(cik)]
+    )
+    args = get_sec_parser().parse_args([*FILINGS, '-s', str(output), '--no-cache', *flags])
+    return SECScraper(args)
+
+
+@pytest.mark.parametrize('mode', [[], ['-a'], ['-r']], ids=['merge', 'append', 'rewrite'])
+def test_failed_cik_survives_save_and_is_resumed(monkeypatch, tmp_path, mode):
+    output = tmp_path / 'out.csv'
+    journal_path = ProgressJournal.path_for(output)
+
+    listed = []
+    scraper = _scraper(monkeypatch, output, {'0000000002'}, listed, *mode)
+    scraper.save_results(scraper.scrape())
+
+    assert journal_path.exists()
+    journal = ProgressJournal(journal_path)
+    assert journal.completed_units() == {'0000000001'}
+    journal.close()
+
+    listed = []
+    scraper = _scraper(monkeypatch, output, set(), listed, '--resume', *mode)
+    scraper.save_results(scraper.scrape())
+
+    assert listed == ['0000000002']
+    assert not journal_path.exists()
+    stored = scraper.load_existing_data().dropna(subset=['Filing Date'])  # An append repeats the CSV header
+    assert sorted(stored['FC']) == ['0000000001-24-000001', '0000000002-24-000001']
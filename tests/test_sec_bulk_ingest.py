@@ -0,0 +1,74 @@
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from arg_parser import get_sec_bulk_parser
+from SEC_bulk_ingest import SECBulkIngester
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'insider_2024q1'
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Path:
+    """Quarterly data set ZIP built from the fixture TSV files"""
+    path = tmp_path / '2024q1_form345.zip'
+    with zipfile.ZipFile(path, 'w') as zf:
+        for table in FIXTURE.glob('*.tsv'):
+            zf.write(table, table.name)
+    return path
+
+
+def _ingester(archive: Path, output: Path, *flags: str) -> SECBulkIngester:
+    return SECBulkIngester(get_sec_bulk_parser().parse_args([str(archive), '-s', str(output), *flags]))
+
+
+def test_ingest_combines_form4_transactions(archive, tmp_path):
+    df = _ingester(archive, tmp_path / 'out.csv').scrape()
+
+    rows = {fc: row for fc, row in zip(df['FC'], df.to_dict('records'))}
+    assert sorted(rows) == ['0000320193-24-000001', '0000320193-24-000002', '0000789019-24-000001']
+
+    purchase = rows['0000320193-24-000001']
+    assert purchase['X'] == 'M'
+    assert purchase['Ticker'] == 'AAPL'
+    assert purchase['Insider Name'] == 'Doe John'
+    assert purchase['Title'] == 'Director'
+    assert purchase['Trade Type'] == 'P - Purchase'
+    assert purchase['Filing Date'] == pd.Timestamp(2024, 1, 2)
+    assert purchase['Trade Date'] == pd.Timestamp(2023, 12, 28)
+    assert (purchase['Price'], purchase['Qty'], purchase['Value']) == (193.0, 400, 77200)
+
+    sale = rows['0000320193-24-000002']
+    assert sale['X'] == 'D'
+    assert sale['Insider Name'] == 'McDonald Mary-Ann'
+    assert sale['Title'] == 'Chief Executive Officer'
+    assert (sale['Trade Type'], sale['Price'], sale['Qty'], sale['Value']) == ('S - Sale', 185.25, -50, 9263)
+
+    exercise = rows['0000789019-24-000001']
+    assert exercise['X'] == 'D'
+    assert exercise['Title'] == 'CFO, 10% Owner'
+    assert (exercise['Trade Type'], exercise['Qty'], exercise['Value']) == ('M - OptEx', 1000, 0)
+
+
+def test_ingest_filters_tickers_case_insensitively(archive, tmp_path):
+    df = _ingester(archive, tmp_path / 'out.csv', '-t', 'aapl').scrape()
+
+    assert set(df['Ticker']) == {'AAPL'}
+    assert len(df) == 2
+
+
+def test_merge_skips_stored_filings(archive, tmp_path):
+    output = tmp_path / 'out.csv'
+    first = _ingester(archive, output, '-t', 'AAPL')
+    first.save_results(first.scrape())
+
+    second = _ingester(archive, output)
+    df = second.scrape()
+    assert list(df['FC']) == ['0000789019-24-000001']
+
+    second.save_results(df)
+    stored = second.load_existing_data()
+    assert len(stored) == 3
+    assert stored['FC'].is_unique
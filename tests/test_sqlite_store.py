@@ -0,0 +1,60 @@
+import sqlite3
+
+import pandas as pd
+
+from base_scraper import BaseScraper
+from schema import apply_schema
+
+
+def _trades(tickers) -> pd.DataFrame:
+    return apply_schema(pd.DataFrame({
+        'Filing Date': '2024-01-02 16:30:00', 'Trade Date': '2024-01-02', 'Ticker': tickers,
+        'Insider Name': 'Doe John', 'Title': 'CEO', 'Trade Type': 'S - Sale', 'Price': 105.0, 'Qty': -10,
+        'Value': -1050.0
+    }))
+
+
+def _stored_tickers(output) -> list:
+    with sqlite3.connect(output) as conn:
+        return sorted(ticker for ticker, in conn.execute('SELECT "Ticker" FROM transactions'))
+
+
+def _legacy_store(output):
+    """Table written without indexes, holding a duplicate"""
+    with sqlite3.connect(output) as conn:
+        _trades(['AAPL', 'AAPL']).to_sql('transactions', conn, index=False)
+
+
+def test_merge_inserts_only_new_keys(tmp_path):
+    output = tmp_path / 'out.db'
+    BaseScraper(output, 'merge').save_results(_trades(['AAPL', 'MSFT']))
+    BaseScraper(output, 'merge').save_results(_trades(['MSFT', 'NVDA', 'NVDA']))
+
+    assert _stored_tickers(output) == ['AAPL', 'MSFT', 'NVDA']
+
+
+def test_append_keeps_every_record(tmp_path):
+    output = tmp_path / 'out.db'
+    BaseScraper(output, 'merge').save_results(_trades(['AAPL']))
+    BaseScraper(output, 'append').save_results(_trades(['AAPL', 'MSFT']))
+
+    assert _stored_tickers(output) == ['AAPL', 'AAPL', 'MSFT']
+
+
+def test_legacy_rows_are_kept_when_merging(tmp_path):
+    output = tmp_path / 'out.db'
+    _legacy_store(output)
+    BaseScraper(output, 'merge').save_results(_trades(['AAPL', 'MSFT']))
+
+    assert _stored_tickers(output) == ['AAPL', 'AAPL', 'MSFT']
+
+
+def test_filtered_load_doesnt_change_schema(tmp_path):
+    output = tmp_path / 'out.db'
+    _legacy_store(output)
+
+    df = BaseScraper(output, 'merge').load_existing_data(tickers=['AAPL'])
+
+    assert len(df) == 2
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'").fetchone() == (0,)